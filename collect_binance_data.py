@@ -6,9 +6,10 @@ Script de collecte des données historiques Binance OHLCV
 """
 
 import os
+import asyncio
 from datetime import datetime
 from loguru import logger
-from src.data.collectors.binance_collector import collect_binance_data
+from src.data.collectors.binance_collector import collect_binance_data_async
 
 logger.info("="*60)
 logger.info("🚀 COLLECTE BINANCE OHLCV - Données Historiques")
@@ -38,14 +39,14 @@ logger.info(f"   Timeframe: {TIMEFRAME} (bougies quotidiennes)")
 logger.info(f"   Historique: {DAYS_BACK} jours")
 logger.info("")
 
-# Lancer la collecte
+# Lancer la collecte (asynchrone : les 5 paires en parallèle)
 try:
-    results = collect_binance_data(
+    results = asyncio.run(collect_binance_data_async(
         symbols=SYMBOLS,
         timeframe=TIMEFRAME,
         days_back=DAYS_BACK,
         save=True
-    )
+    ))
     
     # Résumé
     logger.info("\n" + "="*60)
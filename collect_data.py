@@ -1,22 +1,36 @@
 # collect_data.py
 
+from concurrent.futures import ThreadPoolExecutor
+
 from src.data.collectors.coingecko_collector import collect_coingecko_data
 from src.data.collectors.fear_greed_collector import collect_fear_greed_data
 from loguru import logger
 from datetime import datetime
 
+
+def run_safely(func, **kwargs):
+    """Exécute une collecte en isolant les erreurs (l'autre continue)"""
+    try:
+        return func(**kwargs)
+    except Exception as e:
+        logger.error(f"❌ Erreur collecte {func.__name__}: {e}")
+        return None
+
+
 logger.info("=" * 60)
 logger.info("🚀 COLLECTE DE DONNÉES CRYPTO")
 logger.info(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 logger.info("=" * 60)
 
-# Collecter CoinGecko
-logger.info("\n1️⃣ Collecte CoinGecko...")
-df_coingecko = collect_coingecko_data(save=True)
+# Les deux sources sont indépendantes et I/O-bound : collecte en parallèle
+logger.info("\n🔄 Collecte CoinGecko + Fear & Greed en parallèle...")
+
+with ThreadPoolExecutor(max_workers=2) as pool:
+    future_coingecko = pool.submit(run_safely, collect_coingecko_data, save=True)
+    future_fear_greed = pool.submit(run_safely, collect_fear_greed_data, days=365, save=True)
 
-# Collecter Fear & Greed
-logger.info("\n2️⃣ Collecte Fear & Greed...")
-df_fear_greed = collect_fear_greed_data(days=365, save=True)
+    df_coingecko = future_coingecko.result()
+    df_fear_greed = future_fear_greed.result()
 
 # Résumé
 logger.info("\n" + "=" * 60)
@@ -5,81 +5,128 @@ Script de traitement : applique le feature engineering aux données collectées
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import glob
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from loguru import logger
+from src.data.manifest import update_manifest
 from src.features.feature_engineer import engineer_features
 
-logger.info("=" * 60)
-logger.info("🔧 FEATURE ENGINEERING - Traitement des Données")
-logger.info(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-logger.info("=" * 60)
+# Racine du dataset partitionné (layout Hive : symbol=BTC/run_date=.../part.parquet)
+FEATURES_ROOT = 'data/processed/features'
 
-# Trouver les fichiers les plus récents
-coingecko_files = glob.glob('data/raw/coingecko_*.csv')
-fear_greed_files = glob.glob('data/raw/fear_greed_*.csv')
 
-if not coingecko_files:
-    logger.error("❌ Aucun fichier CoinGecko trouvé. Lancez d'abord: python collect_data.py")
-    exit(1)
+def load_raw_file(filepath):
+    """Charge un fichier brut (Parquet ou ancien CSV)"""
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath)
+    return pd.read_csv(filepath)
 
-latest_coingecko = max(coingecko_files, key=os.path.getctime)
-latest_fear_greed = max(fear_greed_files, key=os.path.getctime) if fear_greed_files else None
 
-logger.info(f"\n📁 Fichiers à traiter:")
-logger.info(f"   CoinGecko: {os.path.basename(latest_coingecko)}")
-if latest_fear_greed:
-    logger.info(f"   Fear & Greed: {os.path.basename(latest_fear_greed)}")
+def process_one_symbol(symbol, df_crypto, df_fear_greed, run_date):
+    """
+    Traite une crypto : feature engineering + écriture dans le dataset
 
-# Charger les données
-df_price = pd.read_csv(latest_coingecko)
-df_fear_greed = pd.read_csv(latest_fear_greed) if latest_fear_greed else None
+    Exécuté dans un worker du ProcessPoolExecutor (chaque crypto est
+    indépendante, le travail pandas est CPU-bound).
 
-logger.info(f"\n📊 Données chargées:")
-logger.info(f"   Prix: {len(df_price)} lignes")
-if df_fear_greed is not None:
-    logger.info(f"   Fear & Greed: {len(df_fear_greed)} lignes")
-
-# Créer dossier processed si nécessaire
-os.makedirs('data/processed', exist_ok=True)
-
-# Traiter chaque crypto séparément
-symbols = df_price['symbol'].unique()
-
-logger.info(f"\n🔄 Traitement de {len(symbols)} cryptos...\n")
-
-for symbol in symbols:
-    logger.info(f"{'='*60}")
-    logger.info(f"💰 Traitement: {symbol}")
-    logger.info(f"{'='*60}")
-    
-    # Filtrer sur la crypto
-    df_crypto = df_price[df_price['symbol'] == symbol].copy()
-    
+    Returns:
+        Tuple (symbol, shape) pour le résumé
+    """
     # Trier par date
     df_crypto = df_crypto.sort_values('timestamp').reset_index(drop=True)
-    
+
     # Appliquer feature engineering
     df_features = engineer_features(df_crypto, df_fear_greed)
-    
-    # Nom du fichier de sortie
-    date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    output_file = f"data/processed/{symbol.lower()}_features_{date_str}.csv"
-    
-    # Sauvegarder
-    df_features.to_csv(output_file, index=False)
-    
-    logger.info(f"📊 Résultat:")
-    logger.info(f"   Shape: {df_features.shape}")
-    logger.info(f"   Features créées: {len(df_features.columns)}")
-    logger.info(f"💾 Sauvegardé: {output_file}\n")
-
-# Résumé final
-logger.info("=" * 60)
-logger.info("📊 RÉSUMÉ DU TRAITEMENT")
-logger.info("=" * 60)
-logger.success(f"✅ {len(symbols)} cryptos traitées avec succès")
-logger.info("📁 Fichiers disponibles dans: data/processed/")
-logger.info("=" * 60)
-logger.success("✅ Feature engineering terminé !")
\ No newline at end of file
+
+    # Sauvegarder dans le dataset partitionné : un seul fragment est relu
+    # ensuite par crypto sélectionnée (partition pruning)
+    df_features['run_date'] = run_date
+    table = pa.Table.from_pandas(df_features, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=FEATURES_ROOT,
+        partition_cols=['symbol', 'run_date'],
+        compression='snappy',
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+    logger.info(f"📊 {symbol}: {df_features.shape[0]} lignes × {df_features.shape[1]} colonnes")
+    logger.info(f"💾 Sauvegardé: {FEATURES_ROOT}/symbol={symbol}/run_date={run_date}")
+
+    return symbol, df_features.shape
+
+
+def main():
+    logger.info("=" * 60)
+    logger.info("🔧 FEATURE ENGINEERING - Traitement des Données")
+    logger.info(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("=" * 60)
+
+    # Trouver les fichiers les plus récents (Parquet en priorité, CSV pour compatibilité)
+    coingecko_files = glob.glob('data/raw/coingecko_*.parquet') + glob.glob('data/raw/coingecko_*.csv')
+    fear_greed_files = glob.glob('data/raw/fear_greed_*.parquet') + glob.glob('data/raw/fear_greed_*.csv')
+
+    if not coingecko_files:
+        logger.error("❌ Aucun fichier CoinGecko trouvé. Lancez d'abord: python collect_data.py")
+        exit(1)
+
+    # Le timestamp est dans le nom de fichier : comparaison lexicale, pas de stat()
+    latest_coingecko = max(coingecko_files)
+    latest_fear_greed = max(fear_greed_files) if fear_greed_files else None
+
+    logger.info(f"\n📁 Fichiers à traiter:")
+    logger.info(f"   CoinGecko: {os.path.basename(latest_coingecko)}")
+    if latest_fear_greed:
+        logger.info(f"   Fear & Greed: {os.path.basename(latest_fear_greed)}")
+
+    # Charger les données
+    df_price = load_raw_file(latest_coingecko)
+    df_fear_greed = load_raw_file(latest_fear_greed) if latest_fear_greed else None
+
+    logger.info(f"\n📊 Données chargées:")
+    logger.info(f"   Prix: {len(df_price)} lignes")
+    if df_fear_greed is not None:
+        logger.info(f"   Fear & Greed: {len(df_fear_greed)} lignes")
+
+    # Créer dossier processed si nécessaire
+    os.makedirs('data/processed', exist_ok=True)
+
+    run_date = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+
+    # Traiter les cryptos en parallèle (pipelines indépendants, 1 worker par crypto)
+    groups = list(df_price.groupby('symbol', sort=False))
+
+    logger.info(f"\n🔄 Traitement de {len(groups)} cryptos en parallèle...\n")
+
+    with ProcessPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as pool:
+        futures = [
+            pool.submit(process_one_symbol, symbol, df_crypto, df_fear_greed, run_date)
+            for symbol, df_crypto in groups
+        ]
+        results = [future.result() for future in futures]
+
+    # Référencer les fragments écrits dans le manifeste (lecture O(1) côté dashboard)
+    update_manifest(
+        features={
+            symbol: f"{FEATURES_ROOT}/symbol={symbol}/run_date={run_date}"
+            for symbol, _ in results
+        },
+        features_run_date=run_date
+    )
+
+    # Résumé final
+    logger.info("=" * 60)
+    logger.info("📊 RÉSUMÉ DU TRAITEMENT")
+    logger.info("=" * 60)
+    logger.success(f"✅ {len(results)} cryptos traitées avec succès")
+    logger.info("📁 Fichiers disponibles dans: data/processed/")
+    logger.info("=" * 60)
+    logger.success("✅ Feature engineering terminé !")
+
+
+if __name__ == "__main__":
+    main()
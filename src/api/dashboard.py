@@ -2,11 +2,14 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime
 import glob
+import io
+import json
 import os
 
 # Configuration de la page
@@ -25,80 +28,300 @@ st.markdown("---")
 # FONCTIONS UTILITAIRES
 # ============================================
 
+# Colonnes réellement utilisées par le dashboard + dtypes explicites :
+# évite de parser les colonnes inutiles et l'inférence de type par colonne
+CG_COLUMNS = ['timestamp', 'symbol', 'price_usd', 'market_cap_usd',
+              'volume_24h_usd', 'price_change_24h_percent']
+CG_DTYPES = {'symbol': 'category', 'price_usd': 'float64', 'market_cap_usd': 'float64',
+             'volume_24h_usd': 'float64', 'price_change_24h_percent': 'float64'}
+FG_COLUMNS = ['timestamp', 'value', 'classification']
+FG_DTYPES = {'value': 'int8', 'classification': 'category'}
+
+def read_data_file(filepath, columns=None, dtype=None):
+    """Lit un fichier de données (Parquet ou ancien CSV)"""
+    if filepath.endswith('.parquet'):
+        # Lecture colonne par colonne : seules les colonnes demandées sont décodées
+        return pd.read_parquet(filepath, columns=columns)
+    return pd.read_csv(filepath, usecols=columns, dtype=dtype)
+
+MANIFEST_PATH = 'data/manifest.json'
+
+def load_manifest():
+    """Lit le manifeste écrit par les scripts de collecte (None si absent)"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def find_latest_raw_files():
+    """Trouve les derniers fichiers CoinGecko et Fear & Greed collectés"""
+
+    # Lecture O(1) via le manifeste : pas de glob ni de stat() par fichier
+    manifest = load_manifest()
+    if manifest:
+        latest_coingecko = manifest.get('coingecko_latest')
+        latest_fear_greed = manifest.get('fear_greed_latest')
+        if latest_coingecko and latest_fear_greed \
+                and os.path.exists(latest_coingecko) and os.path.exists(latest_fear_greed):
+            return latest_coingecko, latest_fear_greed
+
+    # Repli : scan du dossier (anciennes collectes sans manifeste)
+    coingecko_files = glob.glob('data/raw/coingecko_*.parquet') + glob.glob('data/raw/coingecko_*.csv')
+    fear_greed_files = glob.glob('data/raw/fear_greed_*.parquet') + glob.glob('data/raw/fear_greed_*.csv')
+
+    if not coingecko_files or not fear_greed_files:
+        return None, None
+
+    # Le timestamp est encodé dans le nom (coingecko_YYYY-MM-DD_HH-MM-SS.*) :
+    # une comparaison lexicale suffit, sans un stat() par fichier
+    latest_coingecko = max(coingecko_files)
+    latest_fear_greed = max(fear_greed_files)
+
+    return latest_coingecko, latest_fear_greed
+
 @st.cache_data(ttl=60)
 def load_latest_data():
     """Charge les dernières données collectées"""
-    
-    coingecko_files = glob.glob('data/raw/coingecko_*.csv')
-    fear_greed_files = glob.glob('data/raw/fear_greed_*.csv')
-    
-    if not coingecko_files or not fear_greed_files:
+
+    latest_coingecko, latest_fear_greed = find_latest_raw_files()
+
+    if latest_coingecko is None or latest_fear_greed is None:
         return None, None
-    
-    latest_coingecko = max(coingecko_files, key=os.path.getctime)
-    latest_fear_greed = max(fear_greed_files, key=os.path.getctime)
-    
-    df_cg = pd.read_csv(latest_coingecko)
-    df_fg = pd.read_csv(latest_fear_greed)
-    
-    df_cg['timestamp'] = pd.to_datetime(df_cg['timestamp'])
-    df_fg['timestamp'] = pd.to_datetime(df_fg['timestamp'])
-    
+
+    df_cg = read_data_file(latest_coingecko, columns=CG_COLUMNS, dtype=CG_DTYPES)
+    df_fg = read_data_file(latest_fear_greed, columns=FG_COLUMNS, dtype=FG_DTYPES)
+
+    # Les fichiers Parquet restituent des timestamps déjà typés ;
+    # seuls les anciens CSV demandent encore un parsing
+    for df in (df_cg, df_fg):
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+    # Index par symbole : la sélection sidebar devient un accès hashé O(1)
+    # au lieu d'un scan booléen de la colonne à chaque rerun
+    df_cg = df_cg.set_index('symbol', drop=False)
+
     return df_cg, df_fg
 
+FEATURES_ROOT = 'data/processed/features'
+
+def features_available():
+    """Vérifie (sans rien charger) si des features existent sur disque"""
+    manifest = load_manifest()
+    if manifest and manifest.get('features'):
+        return True
+    if os.path.isdir(FEATURES_ROOT):
+        return True
+    return bool(glob.glob('data/processed/*_features_*.parquet')
+                or glob.glob('data/processed/*_features_*.csv'))
+
+def _restore_symbol(df, symbol):
+    """
+    Ré-attache la colonne symbol à un fragment du dataset partitionné
+
+    write_to_dataset(partition_cols=['symbol', ...]) sort la colonne des
+    données pour l'encoder dans le chemin ; une lecture directe du
+    dossier feuille la perdrait sinon.
+    """
+    if 'symbol' not in df.columns:
+        df['symbol'] = symbol
+    return df
+
 @st.cache_data(ttl=60)
-def load_features_data():
-    """Charge les données avec features techniques"""
-    
-    feature_files = glob.glob('data/processed/*_features_*.csv')
-    
+def load_features_for(symbol):
+    """
+    Charge les features de la crypto sélectionnée uniquement
+
+    Cache par symbole : seule la crypto affichée est en mémoire, et un
+    changement de sélection ne recharge que son propre fragment.
+    """
+    # Lecture O(1) via le manifeste
+    manifest = load_manifest()
+    if manifest and manifest.get('features'):
+        path = manifest['features'].get(symbol)
+        if path and os.path.isdir(path):
+            return _restore_symbol(pd.read_parquet(path), symbol)
+
+    # Dataset partitionné : uniquement le dernier run_date de ce symbole
+    symbol_dir = os.path.join(FEATURES_ROOT, f'symbol={symbol}')
+    if os.path.isdir(symbol_dir):
+        run_dirs = glob.glob(os.path.join(symbol_dir, 'run_date=*'))
+        if run_dirs:
+            return _restore_symbol(pd.read_parquet(max(run_dirs)), symbol)
+
+    # Anciens fichiers plats (un fichier par crypto et par run)
+    feature_files = glob.glob(f'data/processed/{symbol.lower()}_features_*.parquet') \
+        + glob.glob(f'data/processed/{symbol.lower()}_features_*.csv')
+
     if not feature_files:
         return None
-    
-    # Grouper par crypto et prendre le plus récent
-    cryptos_data = {}
-    for file in feature_files:
-        basename = os.path.basename(file)
-        crypto = basename.split('_features_')[0].upper()
-        if crypto not in cryptos_data or os.path.getctime(file) > os.path.getctime(cryptos_data[crypto]['file']):
-            cryptos_data[crypto] = {
-                'file': file,
-                'df': pd.read_csv(file)
-            }
-    
-    # Convertir en dict de DataFrames
-    result = {crypto: data['df'] for crypto, data in cryptos_data.items()}
-    
-    return result
+
+    return read_data_file(max(feature_files))
+
+@st.cache_data(ttl=60)
+def compute_fg_stats(filepath, mtime):
+    """
+    Statistiques Fear & Greed mémoïsées
+
+    Clé de cache = (fichier, mtime) : tant que le fichier n'a pas changé,
+    les reruns Streamlit ne recalculent rien.
+    """
+    values = read_data_file(filepath, columns=['value'])['value']
+
+    # Les 5 zones comptées en une seule passe vectorisée (au lieu de
+    # 5 masques booléens qui rescannent chacun toute la colonne)
+    zone_counts = np.bincount(np.searchsorted(FG_BINS, values.to_numpy(), side='left'), minlength=5)
+
+    return {
+        'mean': values.mean(),
+        'median': values.median(),
+        'min': values.min(),
+        'max': values.max(),
+        'std': values.std(),
+        'total': len(values),
+        'zones': zone_counts.tolist()
+    }
+
+@st.cache_data
+def to_parquet_bytes(df):
+    """
+    Sérialise un DataFrame en Parquet pour les boutons de téléchargement
+
+    Mémoïsé par contenu : la sérialisation n'est plus refaite à chaque
+    rerun, et le payload est ~5x plus petit qu'un CSV.
+    """
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+    return buffer.getvalue()
+
+@st.cache_data
+def to_csv_bytes(df):
+    """
+    Sérialise un DataFrame en CSV pour les boutons de téléchargement
+
+    Mémoïsé par contenu comme to_parquet_bytes : format lisible au
+    tableur, sans re-sérialisation à chaque rerun.
+    """
+    return df.to_csv(index=False).encode('utf-8')
+
+# Seuils précalculés : un lookup indexé remplace les échelles de
+# branches Python ré-évaluées à chaque interaction
+FG_BINS = np.array([25, 45, 55, 75])
+FG_EMOJI = np.array(['😱', '😰', '😐', '😃', '🤑'])
+FG_COLOR = np.array(['darkred', 'orange', 'gray', 'lightgreen', 'darkgreen'])
+
+RSI_SIGNALS = [
+    ("🟢 SUR-VENDU (Achat)", "green"),
+    ("🟡 NEUTRE", "orange"),
+    ("🔴 SUR-ACHETÉ (Vente)", "red")
+]
 
 def get_emoji_for_fear_greed(value):
     """Retourne l'emoji correspondant à la valeur Fear & Greed"""
-    if value <= 25:
-        return "😱"
-    elif value <= 45:
-        return "😰"
-    elif value <= 55:
-        return "😐"
-    elif value <= 75:
-        return "😃"
-    else:
-        return "🤑"
+    return FG_EMOJI[np.searchsorted(FG_BINS, value, side='left')]
+
+# ============================================
+# CONSTRUCTION DES FIGURES (mémoïsée)
+# ============================================
+# Les figures ne sont reconstruites que si leurs données d'entrée
+# changent, pas à chaque interaction widget / rerun
+
+@st.cache_data(ttl=60)
+def build_fig_prices(df_cg):
+    """Bar chart prix + variation 24h (tab1)"""
+    fig = px.bar(
+        df_cg,
+        x='symbol',
+        y='price_usd',
+        color='price_change_24h_percent',
+        color_continuous_scale=['red', 'yellow', 'green'],
+        title="Prix et Variation 24h",
+        labels={'price_usd': 'Prix (USD)', 'symbol': 'Crypto'},
+        text='price_usd'
+    )
+    fig.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(ttl=60)
+def build_fig_fear_greed(df_fg):
+    """Courbe historique Fear & Greed (tab3)"""
+    # Couleur par zone, vectorisée : indexation NumPy au lieu d'un apply
+    # qui dispatche une lambda Python par ligne
+    colors = FG_COLOR[np.searchsorted(FG_BINS, df_fg['value'].to_numpy(), side='left')]
+
+    fig = go.Figure()
+
+    # Scattergl : rendu WebGL en un seul draw call au lieu d'un nœud
+    # SVG par marqueur
+    fig.add_trace(go.Scattergl(
+        x=df_fg['timestamp'],
+        y=df_fg['value'],
+        mode='lines+markers',
+        name='Fear & Greed Index',
+        line=dict(color='blue', width=2),
+        marker=dict(size=4, color=colors),
+        fill='tozeroy',
+        fillcolor='rgba(0,100,255,0.1)'
+    ))
+
+    fig.add_hline(y=25, line_dash="dash", line_color="red", annotation_text="Extreme Fear")
+    fig.add_hline(y=75, line_dash="dash", line_color="green", annotation_text="Extreme Greed")
+
+    fig.update_layout(
+        title="Fear & Greed Index sur 365 jours",
+        xaxis_title="Date",
+        yaxis_title="Index (0-100)",
+        height=500,
+        hovermode='x unified'
+    )
+    return fig
+
+@st.cache_data
+def build_fig_sma(price, sma7, sma30):
+    """Comparaison prix vs moyennes mobiles (tab2)"""
+    df_sma = pd.DataFrame({
+        'Indicateur': ['Prix Actuel', 'SMA 7j', 'SMA 30j'],
+        'Valeur': [price, sma7, sma30]
+    })
+    fig = px.bar(
+        df_sma,
+        x='Indicateur',
+        y='Valeur',
+        title="Comparaison Prix vs SMA",
+        text='Valeur'
+    )
+    fig.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+    return fig
+
+@st.cache_data
+def build_fig_bollinger(bb_upper, bb_middle, bb_lower, price):
+    """Bandes de Bollinger (tab2)"""
+    df_bb = pd.DataFrame({
+        'Bande': ['Supérieure', 'Milieu (SMA 20)', 'Inférieure', 'Prix Actuel'],
+        'Valeur': [bb_upper, bb_middle, bb_lower, price]
+    })
+    fig = px.bar(
+        df_bb,
+        x='Bande',
+        y='Valeur',
+        title="Bandes de Bollinger",
+        text='Valeur'
+    )
+    fig.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+    return fig
 
 def get_rsi_signal(rsi):
     """Retourne le signal basé sur RSI"""
-    if rsi < 30:
-        return "🟢 SUR-VENDU (Achat)", "green"
-    elif rsi > 70:
-        return "🔴 SUR-ACHETÉ (Vente)", "red"
-    else:
-        return "🟡 NEUTRE", "orange"
+    return RSI_SIGNALS[int(rsi >= 30) + int(rsi > 70)]
 
 # ============================================
 # CHARGEMENT DES DONNÉES
 # ============================================
 
 df_coingecko, df_fear_greed = load_latest_data()
-df_features = load_features_data()
+has_features = features_available()
 
 if df_coingecko is None or df_fear_greed is None:
     st.error("❌ Aucune donnée trouvée. Lancez d'abord : `python collect_data.py`")
@@ -119,7 +342,7 @@ st.sidebar.metric("💰 Cryptos suivies", nb_cryptos)
 nb_days = len(df_fear_greed)
 st.sidebar.metric("📊 Historique F&G", f"{nb_days} jours")
 
-if df_features:
+if has_features:
     st.sidebar.metric("🔧 Features disponibles", "✅ Oui")
 else:
     st.sidebar.metric("🔧 Features disponibles", "❌ Non")
@@ -135,16 +358,20 @@ selected_crypto = st.sidebar.selectbox(
     index=0
 )
 
-crypto_data = df_coingecko[df_coingecko['symbol'] == selected_crypto].iloc[0]
+crypto_data = df_coingecko.loc[selected_crypto]
+if isinstance(crypto_data, pd.DataFrame):
+    # Plusieurs lignes pour un même symbole : garder la première
+    crypto_data = crypto_data.iloc[0]
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("**🔄 Actualisation automatique**")
 auto_refresh = st.sidebar.checkbox("Activer (60s)", value=False)
 
 if auto_refresh:
-    import time
-    time.sleep(60)
-    st.rerun()
+    from streamlit_autorefresh import st_autorefresh
+    # Timer côté navigateur : le thread serveur n'est plus bloqué 60s
+    # et la sidebar reste interactive entre deux rafraîchissements
+    st_autorefresh(interval=60_000, key='dashrefresh')
 
 # ============================================
 # SECTION 1 : MÉTRIQUES PRINCIPALES
@@ -196,180 +423,133 @@ tab1, tab2, tab3, tab4 = st.tabs(["📊 Vue d'ensemble", "🔧 Indicateurs Techn
 
 with tab1:
     st.header("📊 Comparaison des Prix")
-    
-    fig_prices = px.bar(
-        df_coingecko,
-        x='symbol',
-        y='price_usd',
-        color='price_change_24h_percent',
-        color_continuous_scale=['red', 'yellow', 'green'],
-        title="Prix et Variation 24h",
-        labels={'price_usd': 'Prix (USD)', 'symbol': 'Crypto'},
-        text='price_usd'
-    )
-    
-    fig_prices.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
-    fig_prices.update_layout(height=400)
-    
-    st.plotly_chart(fig_prices, use_container_width=True)
+
+    st.plotly_chart(build_fig_prices(df_coingecko), use_container_width=True)
 
 # ============================================
 # TAB 2 : INDICATEURS TECHNIQUES
 # ============================================
 
 with tab2:
-    if df_features and selected_crypto in df_features:
-        df_feat = df_features[selected_crypto]
-        
+    df_feat = load_features_for(selected_crypto)
+
+    if df_feat is not None:
         st.header(f"🔧 Indicateurs Techniques - {selected_crypto}")
-        
+
+        # Une seule lecture de la ligne courante : chaque accès df[col].iloc[0]
+        # matérialisait une Series transitoire, le dict est lu ~15 fois ensuite
+        row = df_feat.iloc[0].to_dict()
+
         # Métriques RSI, MACD, etc.
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
-            if 'rsi_14' in df_feat.columns:
-                rsi_value = df_feat['rsi_14'].iloc[0]
+            rsi_value = row.get('rsi_14')
+            if rsi_value is not None:
                 rsi_signal, rsi_color = get_rsi_signal(rsi_value)
                 st.metric("RSI (14)", f"{rsi_value:.1f}", delta=rsi_signal)
-        
+
         with col2:
-            if 'sma_crossover' in df_feat.columns:
-                crossover = df_feat['sma_crossover'].iloc[0]
+            crossover = row.get('sma_crossover')
+            if crossover is not None:
                 if crossover == 1:
                     st.metric("SMA Crossover", "✅ Golden Cross", delta="Tendance haussière")
                 else:
                     st.metric("SMA Crossover", "❌ Death Cross", delta="Tendance baissière")
-        
+
         with col3:
-            if 'macd_histogram' in df_feat.columns:
-                macd_hist = df_feat['macd_histogram'].iloc[0]
+            macd_hist = row.get('macd_histogram')
+            if macd_hist is not None:
                 if macd_hist > 0:
                     st.metric("MACD", f"{macd_hist:.2f}", delta="Signal haussier")
                 else:
                     st.metric("MACD", f"{macd_hist:.2f}", delta="Signal baissier")
-        
+
         with col4:
-            if 'volume_spike' in df_feat.columns:
-                spike = df_feat['volume_spike'].iloc[0]
+            spike = row.get('volume_spike')
+            if spike is not None:
                 if spike == 1:
                     st.metric("Volume", "🚀 SPIKE", delta="Volume anormal")
                 else:
                     st.metric("Volume", "📊 Normal", delta="Pas de spike")
-        
+
         st.markdown("---")
-        
+
         # Graphiques des indicateurs
-        
+
         # Note : Pour avoir de vrais graphiques, il faut des données historiques
         # Pour l'instant on affiche les valeurs actuelles
-        
+
         st.subheader("📈 Moyennes Mobiles (SMA)")
-        
+
         col1, col2 = st.columns(2)
-        
+
+        price = row.get('price_usd')
+
         with col1:
-            if all(c in df_feat.columns for c in ['price_usd', 'sma_7', 'sma_30']):
-                data_sma = {
-                    'Indicateur': ['Prix Actuel', 'SMA 7j', 'SMA 30j'],
-                    'Valeur': [
-                        df_feat['price_usd'].iloc[0],
-                        df_feat['sma_7'].iloc[0],
-                        df_feat['sma_30'].iloc[0]
-                    ]
-                }
-                df_sma = pd.DataFrame(data_sma)
-                
-                fig_sma = px.bar(
-                    df_sma,
-                    x='Indicateur',
-                    y='Valeur',
-                    title="Comparaison Prix vs SMA",
-                    text='Valeur'
-                )
-                fig_sma.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+            if all(row.get(c) is not None for c in ['price_usd', 'sma_7', 'sma_30']):
+                fig_sma = build_fig_sma(price, row['sma_7'], row['sma_30'])
                 st.plotly_chart(fig_sma, use_container_width=True)
-        
+
         with col2:
-            if all(c in df_feat.columns for c in ['price_to_sma7_ratio', 'price_to_sma30_ratio']):
-                ratio_7 = df_feat['price_to_sma7_ratio'].iloc[0]
-                ratio_30 = df_feat['price_to_sma30_ratio'].iloc[0]
-                
+            ratio_7 = row.get('price_to_sma7_ratio')
+            ratio_30 = row.get('price_to_sma30_ratio')
+            if ratio_7 is not None and ratio_30 is not None:
                 st.metric("Prix / SMA 7j", f"{ratio_7:.3f}", 
                          delta="Au-dessus" if ratio_7 > 1 else "En-dessous")
                 st.metric("Prix / SMA 30j", f"{ratio_30:.3f}",
                          delta="Au-dessus" if ratio_30 > 1 else "En-dessous")
-                
+
                 if ratio_7 > 1 and ratio_30 > 1:
                     st.success("✅ Prix au-dessus des moyennes mobiles (signal haussier)")
                 elif ratio_7 < 1 and ratio_30 < 1:
                     st.error("❌ Prix en-dessous des moyennes mobiles (signal baissier)")
                 else:
                     st.warning("⚠️ Prix entre SMA 7j et SMA 30j (indécis)")
-        
+
         st.markdown("---")
-        
+
         # Bollinger Bands
         st.subheader("📊 Bandes de Bollinger")
-        
-        if all(c in df_feat.columns for c in ['bb_upper', 'bb_middle', 'bb_lower', 'price_usd']):
+
+        if all(row.get(c) is not None for c in ['bb_upper', 'bb_middle', 'bb_lower', 'price_usd']):
             col1, col2 = st.columns(2)
-            
+
             with col1:
-                data_bb = {
-                    'Bande': ['Supérieure', 'Milieu (SMA 20)', 'Inférieure', 'Prix Actuel'],
-                    'Valeur': [
-                        df_feat['bb_upper'].iloc[0],
-                        df_feat['bb_middle'].iloc[0],
-                        df_feat['bb_lower'].iloc[0],
-                        df_feat['price_usd'].iloc[0]
-                    ]
-                }
-                df_bb = pd.DataFrame(data_bb)
-                
-                fig_bb = px.bar(
-                    df_bb,
-                    x='Bande',
-                    y='Valeur',
-                    title="Bandes de Bollinger",
-                    text='Valeur'
-                )
-                fig_bb.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+                fig_bb = build_fig_bollinger(row['bb_upper'], row['bb_middle'],
+                                             row['bb_lower'], price)
                 st.plotly_chart(fig_bb, use_container_width=True)
-            
+
             with col2:
-                price = df_feat['price_usd'].iloc[0]
-                bb_upper = df_feat['bb_upper'].iloc[0]
-                bb_lower = df_feat['bb_lower'].iloc[0]
-                
-                if price > bb_upper:
+                if price > row['bb_upper']:
                     st.error("🔴 Prix au-dessus de la bande supérieure (sur-acheté)")
-                elif price < bb_lower:
+                elif price < row['bb_lower']:
                     st.success("🟢 Prix en-dessous de la bande inférieure (sur-vendu)")
                 else:
                     st.info("🔵 Prix dans les bandes (normal)")
-                
-                st.metric("Largeur des bandes", f"${df_feat['bb_width'].iloc[0]:,.2f}",
+
+                st.metric("Largeur des bandes", f"${row['bb_width']:,.2f}",
                          delta="Volatilité actuelle")
-        
+
         st.markdown("---")
-        
+
         # Tableau récapitulatif
         st.subheader("📋 Récapitulatif des Indicateurs")
-        
+
         indicators_data = []
-        
-        if 'rsi_14' in df_feat.columns:
-            rsi = df_feat['rsi_14'].iloc[0]
+
+        rsi = row.get('rsi_14')
+        if rsi is not None:
             signal, _ = get_rsi_signal(rsi)
             indicators_data.append({
                 'Indicateur': 'RSI (14)',
                 'Valeur': f"{rsi:.1f}",
                 'Signal': signal
             })
-        
-        if all(c in df_feat.columns for c in ['sma_7', 'sma_30']):
-            sma7 = df_feat['sma_7'].iloc[0]
-            sma30 = df_feat['sma_30'].iloc[0]
+
+        sma7 = row.get('sma_7')
+        sma30 = row.get('sma_30')
+        if sma7 is not None and sma30 is not None:
             indicators_data.append({
                 'Indicateur': 'SMA 7j',
                 'Valeur': f"${sma7:,.2f}",
@@ -380,19 +560,19 @@ with tab2:
                 'Valeur': f"${sma30:,.2f}",
                 'Signal': '🟢 Support' if price > sma30 else '🔴 Résistance'
             })
-        
-        if 'macd' in df_feat.columns:
-            macd = df_feat['macd'].iloc[0]
+
+        macd = row.get('macd')
+        if macd is not None:
             indicators_data.append({
                 'Indicateur': 'MACD',
                 'Valeur': f"{macd:.2f}",
                 'Signal': '🟢 Haussier' if macd > 0 else '🔴 Baissier'
             })
-        
+
         if indicators_data:
             df_indicators = pd.DataFrame(indicators_data)
             st.dataframe(df_indicators, use_container_width=True, hide_index=True)
-        
+
     else:
         st.warning("⚠️ Pas de features techniques disponibles pour cette crypto.")
         st.info("💡 Lancez `python process_features.py` pour générer les indicateurs techniques.")
@@ -404,76 +584,42 @@ with tab2:
 with tab3:
     st.header("😱 Fear & Greed Index - Historique")
     
-    df_fear_greed['color'] = df_fear_greed['value'].apply(
-        lambda x: 'darkred' if x <= 25 else 'orange' if x <= 45 else 'gray' if x <= 55 else 'lightgreen' if x <= 75 else 'darkgreen'
-    )
-    
-    fig_fg = go.Figure()
-    
-    fig_fg.add_trace(go.Scatter(
-        x=df_fear_greed['timestamp'],
-        y=df_fear_greed['value'],
-        mode='lines+markers',
-        name='Fear & Greed Index',
-        line=dict(color='blue', width=2),
-        marker=dict(size=4),
-        fill='tozeroy',
-        fillcolor='rgba(0,100,255,0.1)'
-    ))
-    
-    fig_fg.add_hline(y=25, line_dash="dash", line_color="red", annotation_text="Extreme Fear")
-    fig_fg.add_hline(y=75, line_dash="dash", line_color="green", annotation_text="Extreme Greed")
-    
-    fig_fg.update_layout(
-        title="Fear & Greed Index sur 365 jours",
-        xaxis_title="Date",
-        yaxis_title="Index (0-100)",
-        height=500,
-        hovermode='x unified'
-    )
+    st.plotly_chart(build_fig_fear_greed(df_fear_greed), use_container_width=True)
     
-    st.plotly_chart(fig_fg, use_container_width=True)
-    
-    # Statistiques
+    # Statistiques (mémoïsées : recalculées seulement quand le fichier change)
+    _, latest_fg_file = find_latest_raw_files()
+    fg_stats = compute_fg_stats(latest_fg_file, os.path.getmtime(latest_fg_file))
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.subheader("📊 Statistiques Fear & Greed")
-        
+
         stats_df = pd.DataFrame({
             'Métrique': ['Moyenne', 'Médiane', 'Min', 'Max', 'Écart-type'],
             'Valeur': [
-                f"{df_fear_greed['value'].mean():.1f}",
-                f"{df_fear_greed['value'].median():.1f}",
-                f"{df_fear_greed['value'].min()}",
-                f"{df_fear_greed['value'].max()}",
-                f"{df_fear_greed['value'].std():.1f}"
+                f"{fg_stats['mean']:.1f}",
+                f"{fg_stats['median']:.1f}",
+                f"{fg_stats['min']}",
+                f"{fg_stats['max']}",
+                f"{fg_stats['std']:.1f}"
             ]
         })
-        
+
         st.dataframe(stats_df, hide_index=True, use_container_width=True)
-    
+
     with col2:
         st.subheader("🎨 Distribution")
-        
-        extreme_fear = len(df_fear_greed[df_fear_greed['value'] <= 25])
-        fear = len(df_fear_greed[(df_fear_greed['value'] > 25) & (df_fear_greed['value'] <= 45)])
-        neutral = len(df_fear_greed[(df_fear_greed['value'] > 45) & (df_fear_greed['value'] <= 55)])
-        greed = len(df_fear_greed[(df_fear_greed['value'] > 55) & (df_fear_greed['value'] <= 75)])
-        extreme_greed = len(df_fear_greed[df_fear_greed['value'] > 75])
-        
+
+        # Une seule division vectorisée sur le tableau de comptages
+        zone_pcts = (np.asarray(fg_stats['zones']) / fg_stats['total'] * 100).round(1)
+
         distribution_df = pd.DataFrame({
             'Zone': ['😱 Extreme Fear', '😰 Fear', '😐 Neutral', '😃 Greed', '🤑 Extreme Greed'],
-            'Jours': [extreme_fear, fear, neutral, greed, extreme_greed],
-            'Pourcentage': [
-                f"{extreme_fear/len(df_fear_greed)*100:.1f}%",
-                f"{fear/len(df_fear_greed)*100:.1f}%",
-                f"{neutral/len(df_fear_greed)*100:.1f}%",
-                f"{greed/len(df_fear_greed)*100:.1f}%",
-                f"{extreme_greed/len(df_fear_greed)*100:.1f}%"
-            ]
+            'Jours': fg_stats['zones'],
+            'Pourcentage': [f"{p}%" for p in zone_pcts]
         })
-        
+
         st.dataframe(distribution_df, hide_index=True, use_container_width=True)
 
 # ============================================
@@ -489,10 +635,15 @@ with tab4:
         st.subheader("Dernières données CoinGecko")
         st.dataframe(df_coingecko, use_container_width=True)
         
-        csv_cg = df_coingecko.to_csv(index=False)
+        st.download_button(
+            label="📥 Télécharger Parquet",
+            data=to_parquet_bytes(df_coingecko),
+            file_name=f"coingecko_{datetime.now().strftime('%Y%m%d')}.parquet",
+            mime="application/octet-stream"
+        )
         st.download_button(
             label="📥 Télécharger CSV",
-            data=csv_cg,
+            data=to_csv_bytes(df_coingecko),
             file_name=f"coingecko_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
@@ -501,23 +652,41 @@ with tab4:
         st.subheader("Historique Fear & Greed (30 derniers jours)")
         st.dataframe(df_fear_greed.tail(30), use_container_width=True)
         
-        csv_fg = df_fear_greed.to_csv(index=False)
+        st.download_button(
+            label="📥 Télécharger Parquet",
+            data=to_parquet_bytes(df_fear_greed),
+            file_name=f"fear_greed_{datetime.now().strftime('%Y%m%d')}.parquet",
+            mime="application/octet-stream"
+        )
         st.download_button(
             label="📥 Télécharger CSV",
-            data=csv_fg,
+            data=to_csv_bytes(df_fear_greed),
             file_name=f"fear_greed_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
     
     with subtab3:
-        if df_features and selected_crypto in df_features:
+        df_feat = load_features_for(selected_crypto)
+
+        if df_feat is not None:
             st.subheader(f"Features techniques - {selected_crypto}")
-            st.dataframe(df_features[selected_crypto], use_container_width=True)
-            
-            csv_feat = df_features[selected_crypto].to_csv(index=False)
+
+            # N'envoyer au navigateur que les N dernières lignes : le
+            # rendu client sature au-delà de quelques centaines de lignes,
+            # le téléchargement Parquet sert les données complètes
+            max_rows = st.slider("Lignes affichées", min_value=50, max_value=500,
+                                 value=200, step=50, key="feat_rows")
+            st.dataframe(df_feat.tail(max_rows), use_container_width=True)
+
+            st.download_button(
+                label="📥 Télécharger Parquet",
+                data=to_parquet_bytes(df_feat),
+                file_name=f"{selected_crypto.lower()}_features_{datetime.now().strftime('%Y%m%d')}.parquet",
+                mime="application/octet-stream"
+            )
             st.download_button(
                 label="📥 Télécharger CSV",
-                data=csv_feat,
+                data=to_csv_bytes(df_feat),
                 file_name=f"{selected_crypto.lower()}_features_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
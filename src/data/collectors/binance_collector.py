@@ -6,7 +6,11 @@ Utilise CCXT pour une interface unifiée
 """
 
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import ccxt
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from loguru import logger
@@ -14,6 +18,156 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# numba est optionnel : sans lui, le noyau reste du NumPy vectorisé
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return decorator
+
+
+@njit(cache=True)
+def _derive_ohlcv_metrics(o, h, l, c, v):
+    """Calcule les 4 métriques dérivées en une seule passe sur les colonnes"""
+    pc = c - o
+    pcp = pc / o * 100.0
+    hls = h - l
+    vusd = v * c
+    return pc, pcp, hls, vusd
+
+
+def ohlcv_to_dataframe(ohlcv, symbol, timeframe):
+    """
+    Convertit une liste OHLCV brute ccxt en DataFrame enrichi
+
+    Args:
+        ohlcv (list): Listes [timestamp, open, high, low, close, volume]
+        symbol (str): Paire de trading (ex: 'BTC/USDT')
+        timeframe (str): Intervalle des bougies
+
+    Returns:
+        DataFrame avec colonnes OHLCV + métriques dérivées
+    """
+    # Découpage colonne par colonne via NumPy : un seul memcpy par colonne
+    # au lieu d'un dépaquetage Python ligne à ligne de la liste de listes
+    arr = np.asarray(ohlcv, dtype=np.float64)
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(arr[:, 0].astype('int64'), unit='ms'),
+        'open': arr[:, 1],
+        'high': arr[:, 2],
+        'low': arr[:, 3],
+        'close': arr[:, 4],
+        'volume': arr[:, 5]
+    })
+
+    # Ajouter infos supplémentaires
+    df['symbol'] = symbol.replace('/', '')  # BTC/USDT -> BTCUSDT
+    df['timeframe'] = timeframe
+
+    # Calculer quelques métriques utiles
+    # Noyau fusionné (JIT si numba est présent) : une passe cache-friendly
+    # sur les colonnes contiguës au lieu de 4 broadcasts pandas successifs
+    pc, pcp, hls, vusd = _derive_ohlcv_metrics(
+        arr[:, 1], arr[:, 2], arr[:, 3], arr[:, 4], arr[:, 5]
+    )
+    df['price_change'] = pc
+    df['price_change_pct'] = pcp
+    df['high_low_spread'] = hls
+    df['volume_usd'] = vusd  # Approximation (volume × close)
+
+    # float32 suffit (7 chiffres significatifs) : mémoire et écriture
+    # CSV divisées par deux sur les historiques longs
+    numeric_cols = ['open', 'high', 'low', 'close', 'volume',
+                    'price_change', 'price_change_pct', 'high_low_spread', 'volume_usd']
+    df[numeric_cols] = df[numeric_cols].astype(np.float32)
+
+    return df
+
+
+def save_ohlcv_to_csv(df, filename=None, output_dir='data/raw'):
+    """
+    Sauvegarde un DataFrame OHLCV en CSV
+
+    Args:
+        df (DataFrame): Données à sauvegarder
+        filename (str): Nom du fichier (auto si None)
+        output_dir (str): Dossier de sortie
+
+    Returns:
+        str: Chemin du fichier sauvegardé
+    """
+    if df is None or df.empty:
+        logger.warning("⚠️ Pas de données à sauvegarder")
+        return None
+
+    # Créer le dossier si nécessaire
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Générer nom de fichier si non fourni
+    if filename is None:
+        symbol = df['symbol'].iloc[0].lower()
+        timeframe = df['timeframe'].iloc[0]
+        date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        filename = f"binance_{symbol}_{timeframe}_{date_str}.csv"
+
+    filepath = os.path.join(output_dir, filename)
+
+    # Sauvegarder
+    df.to_csv(filepath, index=False)
+
+    logger.success(f"💾 Données sauvegardées: {filepath}")
+    logger.info(f"   Lignes: {len(df)}")
+    logger.info(f"   Colonnes: {len(df.columns)}")
+    logger.info(f"   Taille: {os.path.getsize(filepath) / 1024:.1f} KB")
+
+    return filepath
+
+
+def save_ohlcv_to_parquet(df, filename=None, output_dir='data/raw'):
+    """
+    Sauvegarde un DataFrame OHLCV en Parquet
+
+    Écriture C++ (pyarrow) bien plus rapide que to_csv, fichier plus
+    compact, et les dtypes (float32, datetime64) sont préservés pour
+    la relecture par process_features.py.
+
+    Args:
+        df (DataFrame): Données à sauvegarder
+        filename (str): Nom du fichier (auto si None)
+        output_dir (str): Dossier de sortie
+
+    Returns:
+        str: Chemin du fichier sauvegardé
+    """
+    if df is None or df.empty:
+        logger.warning("⚠️ Pas de données à sauvegarder")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    if filename is None:
+        symbol = df['symbol'].iloc[0].lower()
+        timeframe = df['timeframe'].iloc[0]
+        date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        filename = f"binance_{symbol}_{timeframe}_{date_str}.parquet"
+
+    filepath = os.path.join(output_dir, filename)
+
+    df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+
+    logger.success(f"💾 Données sauvegardées: {filepath}")
+    logger.info(f"   Lignes: {len(df)}")
+    logger.info(f"   Taille: {os.path.getsize(filepath) / 1024:.1f} KB")
+
+    return filepath
+
 
 class BinanceCollector:
     """
@@ -47,7 +201,12 @@ class BinanceCollector:
             
             # Test de connexion
             self.exchange.load_markets()
-            
+
+            # Figer une fois l'ensemble des symboles et les exemples USDT :
+            # évite de re-scanner les ~2000 markets à chaque fetch_ohlcv
+            self._symbol_set = frozenset(self.exchange.markets)
+            self._usdt_examples = sorted(s for s in self._symbol_set if s.endswith('/USDT'))[:10]
+
             logger.success("✅ Binance Collector initialisé")
             logger.info(f"   Exchange: {self.exchange.id}")
             logger.info(f"   Markets disponibles: {len(self.exchange.markets)}")
@@ -78,10 +237,9 @@ class BinanceCollector:
         
         try:
             # Vérifier que le symbole existe
-            if symbol not in self.exchange.markets:
-                available = [s for s in self.exchange.markets if 'USDT' in s][:10]
+            if symbol not in self._symbol_set:
                 logger.error(f"❌ Symbole {symbol} non trouvé")
-                logger.info(f"   Exemples disponibles: {available}")
+                logger.info(f"   Exemples disponibles: {self._usdt_examples}")
                 return None
             
             # Récupérer les données
@@ -95,26 +253,10 @@ class BinanceCollector:
             if not ohlcv:
                 logger.warning(f"⚠️ Aucune donnée reçue pour {symbol}")
                 return None
-            
-            # Convertir en DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            
-            # Convertir timestamp (millisecondes) en datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            
-            # Ajouter infos supplémentaires
-            df['symbol'] = symbol.replace('/', '')  # BTC/USDT -> BTCUSDT
-            df['timeframe'] = timeframe
-            
-            # Calculer quelques métriques utiles
-            df['price_change'] = df['close'] - df['open']
-            df['price_change_pct'] = (df['price_change'] / df['open']) * 100
-            df['high_low_spread'] = df['high'] - df['low']
-            df['volume_usd'] = df['volume'] * df['close']  # Approximation
-            
+
+            # Convertir en DataFrame enrichi
+            df = ohlcv_to_dataframe(ohlcv, symbol, timeframe)
+
             logger.success(f"✅ {len(df)} bougies collectées pour {symbol}")
             logger.info(f"   Période: {df['timestamp'].min()} → {df['timestamp'].max()}")
             logger.info(f"   Prix: ${df['close'].iloc[-1]:,.2f} (dernier)")
@@ -150,26 +292,54 @@ class BinanceCollector:
         logger.info(f"\n{'='*60}")
         logger.info(f"📥 COLLECTE MULTIPLE: {len(symbols)} cryptos")
         logger.info(f"{'='*60}\n")
-        
+
         results = {}
-        
-        for i, symbol in enumerate(symbols, 1):
-            logger.info(f"[{i}/{len(symbols)}] {symbol}")
-            
-            df = self.fetch_ohlcv(symbol, timeframe, limit)
-            
-            if df is not None:
-                results[symbol] = df
-                logger.info("")
-            else:
-                logger.warning(f"⚠️ {symbol} ignoré (erreur)\n")
-        
+
+        # Les requêtes sont I/O-bound (latence réseau Binance) : les lancer
+        # en parallèle fait passer le temps total de N×latence à ~latence
+        with ThreadPoolExecutor(max_workers=min(4, len(symbols))) as pool:
+            futures = {
+                pool.submit(self.fetch_ohlcv, symbol, timeframe, limit): symbol
+                for symbol in symbols
+            }
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                df = future.result()
+
+                if df is not None:
+                    results[symbol] = df
+                else:
+                    logger.warning(f"⚠️ {symbol} ignoré (erreur)\n")
+
         logger.info(f"{'='*60}")
         logger.success(f"✅ Collecte terminée: {len(results)}/{len(symbols)} cryptos")
         logger.info(f"{'='*60}")
         
         return results
     
+    def _find_listing_date(self, symbol, timeframe='1d'):
+        """
+        Trouve la date de listing d'une paire en une seule requête
+
+        Quand `since` précède le listing, Binance renvoie les bougies à
+        partir de la première disponible : une sonde d'une bougie depuis
+        l'époque renvoie donc directement la bougie de listing.
+
+        Args:
+            symbol (str): Paire de trading
+            timeframe (str): Intervalle utilisé pour la sonde
+
+        Returns:
+            int: Timestamp (millisecondes) de la première bougie
+        """
+        candles = self.exchange.fetch_ohlcv(symbol, timeframe, since=0, limit=1)
+        if candles:
+            return int(candles[0][0])
+
+        # Pas d'historique renvoyé : repli sur l'ouverture de Binance
+        return int(datetime(2017, 1, 1).timestamp() * 1000)
+
     def fetch_historical_range(self, symbol='BTC/USDT', timeframe='1d', days_back=365):
         """
         Collecte historique complet (gère la limite de 1000 bougies)
@@ -188,23 +358,20 @@ class BinanceCollector:
         # Binance limite à 1000 bougies par requête
         # Pour 1 an (365 jours) avec timeframe='1d', une requête suffit
         # Pour timeframes plus courts, faire plusieurs requêtes
-        
-        timeframe_to_ms = {
-            '1m': 60 * 1000,
-            '5m': 5 * 60 * 1000,
-            '15m': 15 * 60 * 1000,
-            '1h': 60 * 60 * 1000,
-            '4h': 4 * 60 * 60 * 1000,
-            '1d': 24 * 60 * 60 * 1000,
-        }
-        
-        if timeframe not in timeframe_to_ms:
-            logger.warning(f"⚠️ Timeframe {timeframe} non supporté, utilise fetch_ohlcv directement")
-            return self.fetch_ohlcv(symbol, timeframe, limit=days_back)
-        
-        # Calculer nombre de bougies nécessaires
-        ms_per_candle = timeframe_to_ms[timeframe]
+
+        # parse_timeframe gère tous les intervalles ccxt ('3m', '2h', '1w', '1M'...)
+        # sans table codée en dur ni repli aux mauvaises sémantiques
+        ms_per_candle = self.exchange.parse_timeframe(timeframe) * 1000
         ms_back = days_back * 24 * 60 * 60 * 1000
+
+        # Ne pas remonter avant la date de listing : inutile d'interroger
+        # Binance sur des périodes où la paire n'existait pas
+        listing_ms = self._find_listing_date(symbol, timeframe)
+        ms_since_listing = self.exchange.milliseconds() - listing_ms
+        if ms_since_listing < ms_back:
+            logger.info(f"   Paire listée il y a {ms_since_listing // (24*60*60*1000)} jours, historique réduit")
+            ms_back = ms_since_listing
+
         candles_needed = ms_back // ms_per_candle
         
         if candles_needed <= 1000:
@@ -225,8 +392,11 @@ class BinanceCollector:
             
             all_data.append(df)
             
-            # Prochaine requête commence après la dernière bougie
-            since = int(df['timestamp'].iloc[-1].timestamp() * 1000) + ms_per_candle
+            # Prochaine requête commence après la dernière bougie.
+            # Lecture entière directe du datetime64 : pas d'objet Timestamp
+            # intermédiaire ni de conversion float par itération
+            last_ms = int(df['timestamp'].values[-1].astype('datetime64[ms]').astype('int64'))
+            since = last_ms + ms_per_candle
             
             logger.info(f"   Collecté: {sum(len(d) for d in all_data)}/{candles_needed}")
             
@@ -238,9 +408,17 @@ class BinanceCollector:
             logger.error("❌ Aucune donnée collectée")
             return None
         
-        # Fusionner tous les DataFrames
+        # Fusionner tous les DataFrames : les chunks sont déjà triés et
+        # disjoints (le pointeur `since` avance après la dernière bougie),
+        # inutile de payer un drop_duplicates + sort_values en O(N log N).
+        # Vérification explicite malgré tout : si Binance renvoyait une
+        # bougie de frontière en double, on nettoie comme avant
         df_complete = pd.concat(all_data, ignore_index=True)
-        df_complete = df_complete.drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+        ts = df_complete['timestamp'].to_numpy()
+        if len(ts) > 1 and not (ts[1:] > ts[:-1]).all():
+            logger.warning("⚠️ Bougies désordonnées ou dupliquées détectées, nettoyage")
+            df_complete = df_complete.drop_duplicates(subset=['timestamp']) \
+                .sort_values('timestamp').reset_index(drop=True)
         
         logger.success(f"✅ Historique complet: {len(df_complete)} bougies")
         
@@ -258,32 +436,134 @@ class BinanceCollector:
         Returns:
             str: Chemin du fichier sauvegardé
         """
-        
-        if df is None or df.empty:
-            logger.warning("⚠️ Pas de données à sauvegarder")
-            return None
-        
-        # Créer le dossier si nécessaire
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Générer nom de fichier si non fourni
-        if filename is None:
-            symbol = df['symbol'].iloc[0].lower()
-            timeframe = df['timeframe'].iloc[0]
-            date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"binance_{symbol}_{timeframe}_{date_str}.csv"
-        
-        filepath = os.path.join(output_dir, filename)
-        
-        # Sauvegarder
-        df.to_csv(filepath, index=False)
-        
-        logger.success(f"💾 Données sauvegardées: {filepath}")
-        logger.info(f"   Lignes: {len(df)}")
-        logger.info(f"   Colonnes: {len(df.columns)}")
-        logger.info(f"   Taille: {os.path.getsize(filepath) / 1024:.1f} KB")
-        
-        return filepath
+
+        return save_ohlcv_to_csv(df, filename=filename, output_dir=output_dir)
+
+    def save_to_parquet(self, df, filename=None, output_dir='data/raw'):
+        """
+        Sauvegarde les données OHLCV en Parquet (dtypes préservés)
+
+        Args:
+            df (DataFrame): Données à sauvegarder
+            filename (str): Nom du fichier (auto si None)
+            output_dir (str): Dossier de sortie
+
+        Returns:
+            str: Chemin du fichier sauvegardé
+        """
+
+        return save_ohlcv_to_parquet(df, filename=filename, output_dir=output_dir)
+
+
+async def _fetch_symbol_async(exchange, semaphore, symbol, timeframe, since, ms_per_candle):
+    """
+    Récupère l'historique complet d'une paire sous contrôle du sémaphore
+
+    Binance limite chaque requête à 1000 bougies : on pagine en avançant
+    `since` après la dernière bougie reçue jusqu'à la page incomplète.
+    Le sémaphore n'est tenu que pendant chaque requête, pas entre deux
+    pages, pour ne pas bloquer les autres paires.
+
+    Les erreurs sont contenues par paire (comme fetch_ohlcv côté sync) :
+    une paire délistée ou une erreur réseau ne fait pas échouer le
+    gather, les autres symboles continuent.
+    """
+    all_candles = []
+
+    try:
+        while True:
+            async with semaphore:
+                ohlcv = await exchange.fetch_ohlcv(symbol, timeframe=timeframe,
+                                                   since=since, limit=1000)
+            if not ohlcv:
+                break
+
+            all_candles.extend(ohlcv)
+
+            if len(ohlcv) < 1000:
+                # Dernière page
+                break
+
+            since = int(ohlcv[-1][0]) + ms_per_candle
+
+    except ccxt.NetworkError as e:
+        logger.error(f"❌ Erreur réseau pour {symbol}: {e}")
+    except ccxt.ExchangeError as e:
+        logger.error(f"❌ Erreur Binance pour {symbol}: {e}")
+    except Exception as e:
+        logger.error(f"❌ Erreur inattendue pour {symbol}: {e}")
+
+    return symbol, all_candles
+
+
+async def collect_binance_data_async(symbols=None, timeframe='1d', days_back=365,
+                                     save=True, max_concurrency=4):
+    """
+    Collecte OHLCV asynchrone : toutes les paires en parallèle
+
+    La collecte est 100% I/O-bound (latence réseau Binance), donc les
+    requêtes sont lancées en parallèle via ccxt.async_support avec un
+    sémaphore pour rester sous la limite de 1200 req/min.
+
+    Args:
+        symbols (list): Liste de paires (défaut: BTC, ETH, BNB, SOL, ADA)
+        timeframe (str): Intervalle (défaut: 1 jour)
+        days_back (int): Historique en jours (défaut: 365)
+        save (bool): Sauvegarder en CSV (défaut: True)
+        max_concurrency (int): Requêtes simultanées max (défaut: 4)
+
+    Returns:
+        dict: {symbol: DataFrame}
+    """
+    import ccxt.async_support as ccxt_async
+
+    if symbols is None:
+        symbols = ['BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'SOL/USDT', 'ADA/USDT']
+
+    logger.info(f"📥 Collecte async: {len(symbols)} paires ({timeframe}, {days_back} jours)")
+
+    exchange = ccxt_async.binance({
+        'apiKey': os.getenv('BINANCE_API_KEY'),
+        'secret': os.getenv('BINANCE_SECRET_KEY'),
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': 'spot',
+            'adjustForTimeDifference': True
+        }
+    })
+
+    results = {}
+
+    try:
+        since = exchange.milliseconds() - days_back * 24 * 60 * 60 * 1000
+        ms_per_candle = exchange.parse_timeframe(timeframe) * 1000
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        fetched = await asyncio.gather(*(
+            _fetch_symbol_async(exchange, semaphore, symbol, timeframe, since, ms_per_candle)
+            for symbol in symbols
+        ))
+
+        for symbol, ohlcv in fetched:
+            if not ohlcv:
+                logger.warning(f"⚠️ Aucune donnée reçue pour {symbol}")
+                continue
+
+            df = ohlcv_to_dataframe(ohlcv, symbol, timeframe)
+            results[symbol] = df
+            logger.success(f"✅ {len(df)} bougies collectées pour {symbol}")
+
+            if save:
+                save_ohlcv_to_csv(df)
+
+    except Exception as e:
+        logger.error(f"❌ Erreur collecte async Binance: {e}")
+    finally:
+        await exchange.close()
+
+    logger.success(f"✅ Collecte async terminée: {len(results)}/{len(symbols)} cryptos")
+
+    return results
 
 
 # Fonction utilitaire pour usage simple
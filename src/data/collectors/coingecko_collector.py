@@ -7,6 +7,19 @@ from datetime import datetime
 from loguru import logger
 from dotenv import load_dotenv
 
+from ..manifest import update_manifest
+
+# orjson décode le JSON 3-5x plus vite que le module stdlib ;
+# repli silencieux sur response.json() s'il n'est pas installé
+try:
+    import orjson
+
+    def _parse_json(response):
+        return orjson.loads(response.content)
+except ImportError:
+    def _parse_json(response):
+        return response.json()
+
 load_dotenv()
 
 class CoinGeckoCollector:
@@ -19,7 +32,12 @@ class CoinGeckoCollector:
         
         self.base_url = "https://api.coingecko.com/api/v3"
         self.headers = {'x-cg-demo-api-key': self.api_key}
-        
+
+        # Session persistante : la connexion TLS est réutilisée entre les
+        # appels (~1 RTT + handshake économisés par requête)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
         logger.info("✅ CoinGecko Collector initialisé")
     
     def fetch_current_prices(self, symbols=None):
@@ -49,26 +67,25 @@ class CoinGeckoCollector:
                 'include_last_updated_at': 'true'
             }
             
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
             
-            # Transformer en DataFrame
-            rows = []
+            # Transformer en DataFrame : construction par colonnes (SoA),
+            # pandas n'a plus à re-parser une liste de dicts ligne à ligne
             timestamp = datetime.now()
-            
-            for symbol, info in data.items():
-                rows.append({
-                    'timestamp': timestamp,
-                    'symbol': symbol.upper(),
-                    'price_usd': info.get('usd', 0),
-                    'market_cap_usd': info.get('usd_market_cap', 0),
-                    'volume_24h_usd': info.get('usd_24h_vol', 0),
-                    'price_change_24h_percent': info.get('usd_24h_change', 0),
-                    'last_updated': datetime.fromtimestamp(info.get('last_updated_at', 0))
-                })
-            
-            df = pd.DataFrame(rows)
+            infos = list(data.values())
+
+            df = pd.DataFrame({
+                'timestamp': [timestamp] * len(infos),
+                'symbol': [symbol.upper() for symbol in data],
+                'price_usd': [info.get('usd', 0) for info in infos],
+                'market_cap_usd': [info.get('usd_market_cap', 0) for info in infos],
+                'volume_24h_usd': [info.get('usd_24h_vol', 0) for info in infos],
+                'price_change_24h_percent': [info.get('usd_24h_change', 0) for info in infos],
+                # Conversion epoch → datetime vectorisée en une passe C
+                'last_updated': pd.to_datetime([info.get('last_updated_at', 0) for info in infos], unit='s')
+            })
             
             logger.success(f"✅ {len(df)} cryptos collectées")
             return df
@@ -88,9 +105,9 @@ class CoinGeckoCollector:
         
         try:
             url = f"{self.base_url}/global"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()['data']
+            data = _parse_json(response)['data']
             
             global_info = {
                 'timestamp': datetime.now(),
@@ -108,10 +125,10 @@ class CoinGeckoCollector:
             logger.error(f"❌ Erreur collecte données globales: {e}")
             return None
     
-    def save_to_csv(self, df, filename=None):
+    def save_to_parquet(self, df, filename=None):
         """
-        Sauvegarde le DataFrame en CSV
-        
+        Sauvegarde le DataFrame en Parquet (colonne + compression snappy)
+
         Args:
             df: DataFrame à sauvegarder
             filename: Nom du fichier (optionnel)
@@ -119,21 +136,28 @@ class CoinGeckoCollector:
         if df is None or df.empty:
             logger.warning("⚠️ Pas de données à sauvegarder")
             return None
-        
+
         # Créer le dossier data/raw si nécessaire
         os.makedirs('data/raw', exist_ok=True)
-        
+
         # Générer le nom de fichier avec date
         if filename is None:
             date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"coingecko_{date_str}.csv"
-        
+            filename = f"coingecko_{date_str}.parquet"
+
         filepath = os.path.join('data/raw', filename)
-        
-        # Sauvegarder
-        df.to_csv(filepath, index=False)
+
+        # Timestamps en colonnes typées (INT64 Parquet) : aucune chaîne
+        # à re-parser côté lecture
+        df = df.assign(timestamp=pd.to_datetime(df['timestamp']))
+
+        # Sauvegarder (Parquet = ~5-10x plus compact qu'un CSV, lecture par colonne)
+        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
         logger.success(f"💾 Données sauvegardées: {filepath}")
-        
+
+        # Référencer le fichier dans le manifeste (lecture O(1) côté dashboard)
+        update_manifest(coingecko_latest=filepath)
+
         return filepath
 
 
@@ -141,9 +165,9 @@ class CoinGeckoCollector:
 def collect_coingecko_data(save=True):
     """
     Collecte et sauvegarde les données CoinGecko
-    
+
     Args:
-        save: Si True, sauvegarde en CSV
+        save: Si True, sauvegarde en Parquet
     
     Returns:
         DataFrame avec les données
@@ -161,7 +185,7 @@ def collect_coingecko_data(save=True):
     
     # Sauvegarder
     if save and df is not None:
-        collector.save_to_csv(df)
+        collector.save_to_parquet(df)
     
     return df
 
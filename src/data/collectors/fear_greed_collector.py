@@ -2,11 +2,25 @@
 
 import os
 import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from loguru import logger
 from dotenv import load_dotenv
 
+from ..manifest import update_manifest
+
+# orjson décode le JSON 3-5x plus vite que le module stdlib ;
+# repli silencieux sur response.json() s'il n'est pas installé
+try:
+    import orjson
+
+    def _parse_json(response):
+        return orjson.loads(response.content)
+except ImportError:
+    def _parse_json(response):
+        return response.json()
+
 load_dotenv()
 
 class FearGreedCollector:
@@ -14,6 +28,11 @@ class FearGreedCollector:
     
     def __init__(self):
         self.url = os.getenv('FEAR_GREED_URL', 'https://api.alternative.me/fng/')
+
+        # Session persistante : la connexion TLS est réutilisée entre les
+        # appels (index actuel + historique sur le même socket)
+        self.session = requests.Session()
+
         logger.info("✅ Fear & Greed Collector initialisé")
     
     def fetch_current_index(self):
@@ -26,9 +45,9 @@ class FearGreedCollector:
         logger.info("📥 Collecte Fear & Greed actuel...")
         
         try:
-            response = requests.get(self.url, timeout=10)
+            response = self.session.get(self.url, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = _parse_json(response)
             
             current = data['data'][0]
             
@@ -59,22 +78,25 @@ class FearGreedCollector:
         
         try:
             url = f"{self.url}?limit={days}"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            # Transformer en DataFrame
-            rows = []
-            for entry in data['data']:
-                rows.append({
-                    'timestamp': datetime.fromtimestamp(int(entry['timestamp'])),
-                    'value': int(entry['value']),
-                    'classification': entry['value_classification']
-                })
+            data = _parse_json(response)
             
-            df = pd.DataFrame(rows)
+            # Transformer en DataFrame : construction par colonnes (SoA),
+            # pandas n'a plus à re-parser 365 dicts ligne à ligne.
+            # value ∈ [0, 100] : int8 suffit ; classification ne prend que
+            # ~5 libellés → category (dictionary-encodé dans le Parquet)
+            entries = data['data']
+            df = pd.DataFrame({
+                # Conversion epoch → datetime vectorisée (une seule passe C,
+                # pas un datetime.fromtimestamp Python par ligne)
+                'timestamp': pd.to_datetime([int(e['timestamp']) for e in entries], unit='s'),
+                'value': np.fromiter((int(e['value']) for e in entries),
+                                     dtype=np.int8, count=len(entries)),
+                'classification': pd.Categorical([e['value_classification'] for e in entries])
+            })
             df = df.sort_values('timestamp')  # Ordre chronologique
-            
+
             logger.success(f"✅ {len(df)} jours collectés")
             return df
             
@@ -82,10 +104,10 @@ class FearGreedCollector:
             logger.error(f"❌ Erreur collecte historique: {e}")
             return None
     
-    def save_to_csv(self, df, filename=None):
+    def save_to_parquet(self, df, filename=None):
         """
-        Sauvegarde le DataFrame en CSV
-        
+        Sauvegarde le DataFrame en Parquet (colonne + compression snappy)
+
         Args:
             df: DataFrame à sauvegarder
             filename: Nom du fichier (optionnel)
@@ -93,21 +115,28 @@ class FearGreedCollector:
         if df is None or df.empty:
             logger.warning("⚠️ Pas de données à sauvegarder")
             return None
-        
+
         # Créer le dossier data/raw si nécessaire
         os.makedirs('data/raw', exist_ok=True)
-        
+
         # Générer le nom de fichier avec date
         if filename is None:
             date_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"fear_greed_{date_str}.csv"
-        
+            filename = f"fear_greed_{date_str}.parquet"
+
         filepath = os.path.join('data/raw', filename)
-        
-        # Sauvegarder
-        df.to_csv(filepath, index=False)
+
+        # Timestamps en colonnes typées (INT64 Parquet) : aucune chaîne
+        # à re-parser côté lecture
+        df = df.assign(timestamp=pd.to_datetime(df['timestamp']))
+
+        # Sauvegarder (Parquet = ~5-10x plus compact qu'un CSV, lecture par colonne)
+        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
         logger.success(f"💾 Données sauvegardées: {filepath}")
-        
+
+        # Référencer le fichier dans le manifeste (lecture O(1) côté dashboard)
+        update_manifest(fear_greed_latest=filepath)
+
         return filepath
 
 
@@ -118,7 +147,7 @@ def collect_fear_greed_data(days=365, save=True):
     
     Args:
         days: Nombre de jours d'historique
-        save: Si True, sauvegarde en CSV
+        save: Si True, sauvegarde en Parquet
     
     Returns:
         DataFrame avec les données
@@ -136,7 +165,7 @@ def collect_fear_greed_data(days=365, save=True):
     
     # Sauvegarder
     if save and df is not None:
-        collector.save_to_csv(df)
+        collector.save_to_parquet(df)
     
     return df
 
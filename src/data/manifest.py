@@ -0,0 +1,68 @@
+# src/data/manifest.py
+
+"""
+Manifeste des derniers fichiers de données
+
+Évite aux lecteurs (dashboard, scripts d'aperçu) de re-scanner data/raw
+et data/processed à chaque chargement : une seule lecture JSON remplace
+un glob + un stat() par fichier candidat.
+"""
+
+import json
+import os
+import threading
+import time
+from loguru import logger
+
+MANIFEST_PATH = 'data/manifest.json'
+
+# Sérialise le lire-fusionner-écrire : les collecteurs tournent en
+# threads parallèles dans collect_data.py, et deux mises à jour
+# simultanées se perdraient mutuellement sans verrou
+_manifest_lock = threading.Lock()
+
+
+def load_manifest():
+    """
+    Charge le manifeste s'il existe
+
+    Returns:
+        Dict avec les derniers chemins connus, ou None
+    """
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def update_manifest(**entries):
+    """
+    Met à jour le manifeste de façon atomique
+
+    Le verrou couvre tout le lire-fusionner-écrire (os.replace ne rend
+    atomique que l'écriture du fichier, pas la fusion) : sans lui, deux
+    collecteurs en threads parallèles peuvent perdre la clé de l'autre.
+
+    Args:
+        entries: Clés à mettre à jour (ex: coingecko_latest='data/raw/...')
+                 La clé 'features' est fusionnée symbole par symbole.
+    """
+    with _manifest_lock:
+        manifest = load_manifest() or {}
+
+        features = entries.pop('features', None)
+        if features:
+            manifest.setdefault('features', {}).update(features)
+
+        manifest.update(entries)
+        manifest['mtime'] = time.time()
+
+        tmp_path = MANIFEST_PATH + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, MANIFEST_PATH)
+
+    logger.info(f"📒 Manifeste mis à jour: {MANIFEST_PATH}")
+
+    return manifest
@@ -5,22 +5,40 @@ Feature Engineering pour les données crypto
 Transforme les données brutes en features ML-ready
 """
 
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from loguru import logger
 
+from . import kernels
 from .technical_indicators import (
-    calculate_sma,
-    calculate_ema,
-    calculate_rsi,
-    calculate_macd,
-    calculate_bollinger_bands,
     calculate_price_changes,
     calculate_volume_indicators
 )
 
 
+# Longueurs des mois (année non bissextile), indexées par mois - 1
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int8)
+
+
+def _ffill_float(values):
+    """
+    Forward-fill vectorisé d'un tableau float
+
+    Propage l'indice du dernier élément non-NaN via maximum.accumulate
+    puis réindexe : pas de boucle Python ni de masque NA pandas.
+    Les NaN de tête restent NaN (comme Series.ffill).
+    """
+    mask = ~np.isnan(values)
+    idx = np.where(mask, np.arange(len(values)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx]
+
+
 class CryptoFeatureEngineer:
     """
     Classe principale pour le feature engineering des données crypto
@@ -42,42 +60,38 @@ class CryptoFeatureEngineer:
             DataFrame enrichi avec indicateurs techniques
         """
         logger.info("📊 Calcul des indicateurs techniques...")
-        
-        df = df.copy()
-        
-        # Moving Averages
-        df['sma_7'] = calculate_sma(df, price_col, window=7)
-        df['sma_30'] = calculate_sma(df, price_col, window=30)
-        df['ema_12'] = calculate_ema(df, price_col, span=12)
-        df['ema_26'] = calculate_ema(df, price_col, span=26)
-        
-        # RSI
-        df['rsi_14'] = calculate_rsi(df, price_col, period=14)
-        
-        # MACD
-        macd_df = calculate_macd(df, price_col)
-        df = pd.concat([df, macd_df], axis=1)
-        
-        # Bollinger Bands
-        bb_df = calculate_bollinger_bands(df, price_col)
-        df = pd.concat([df, bb_df], axis=1)
-        
-        # Price Changes
-        changes_df = calculate_price_changes(df, price_col, periods=[1, 7, 30])
-        df = pd.concat([df, changes_df], axis=1)
-        
-        # Volume Indicators
+
+        # Pas de df.copy() : la concaténation finale produit de toute
+        # façon un nouveau DataFrame, l'entrée n'est jamais modifiée
+
+        # SMA, EMA, RSI, MACD et Bollinger calculés en une seule passe
+        # compilée sur les prix (au lieu de ~8 rolling/ewm pandas successifs).
+        # La matrice devient un bloc DataFrame d'un coup : pas de colonne
+        # insérée une à une qui fragmenterait le BlockManager
+        prices = df[price_col].to_numpy(np.float64)
+        indicator_matrix = kernels.indicators(prices)
+        indicators_df = pd.DataFrame(indicator_matrix,
+                                     columns=list(kernels.INDICATOR_COLUMNS),
+                                     index=df.index, copy=False)
+
+        # Price Changes + Volume Indicators (dicts de ndarrays)
+        extra = calculate_price_changes(df, price_col, periods=[1, 7, 30])
         if volume_col in df.columns:
-            volume_df = calculate_volume_indicators(df, volume_col)
-            df = pd.concat([df, volume_df], axis=1)
-        
-        # Price to SMA ratio (signal de tendance)
-        df['price_to_sma7_ratio'] = df[price_col] / df['sma_7']
-        df['price_to_sma30_ratio'] = df[price_col] / df['sma_30']
-        
+            extra.update(calculate_volume_indicators(df, volume_col))
+
+        # Price to SMA ratio (signal de tendance) — directement depuis la matrice
+        sma7 = indicator_matrix[:, 0]
+        sma30 = indicator_matrix[:, 1]
+        extra['price_to_sma7_ratio'] = prices / sma7
+        extra['price_to_sma30_ratio'] = prices / sma30
+
         # SMA Crossover (signal d'achat/vente)
-        df['sma_crossover'] = (df['sma_7'] > df['sma_30']).astype(int)
-        
+        extra['sma_crossover'] = (sma7 > sma30).astype(np.int8)
+
+        # Une seule concaténation horizontale pour les ~20 nouvelles colonnes
+        df = pd.concat([df, indicators_df, pd.DataFrame(extra, index=df.index)],
+                       axis=1, copy=False)
+
         logger.success(f"✅ {len(df.columns)} features créées (indicateurs techniques)")
         
         return df
@@ -86,33 +100,54 @@ class CryptoFeatureEngineer:
         """
         Ajoute des features temporelles
         
+        Écrit les colonnes directement dans le DataFrame reçu (pas de
+        copie : dans le pipeline, le frame est déjà détenu par l'étape
+        précédente).
+
         Args:
             df: DataFrame avec colonne timestamp
             timestamp_col: Nom colonne timestamp
-        
+
         Returns:
             DataFrame avec features temporelles
         """
         logger.info("📅 Ajout des features temporelles...")
-        
-        df = df.copy()
-        
+
         # Convertir en datetime si nécessaire
         if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
             df[timestamp_col] = pd.to_datetime(df[timestamp_col])
         
-        # Extraire composantes temporelles
-        df['year'] = df[timestamp_col].dt.year
-        df['month'] = df[timestamp_col].dt.month
-        df['day'] = df[timestamp_col].dt.day
-        df['day_of_week'] = df[timestamp_col].dt.dayofweek  # 0=Lundi, 6=Dimanche
-        df['hour'] = df[timestamp_col].dt.hour
-        df['quarter'] = df[timestamp_col].dt.quarter
-        
-        # Features binaires
-        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)  # Samedi/Dimanche
-        df['is_month_start'] = df[timestamp_col].dt.is_month_start.astype(int)
-        df['is_month_end'] = df[timestamp_col].dt.is_month_end.astype(int)
+        # Extraire les composantes temporelles par arithmétique datetime64 :
+        # les vues [Y]/[M]/[D]/[h] dérivent tout de quelques conversions au
+        # lieu de neuf accesseurs .dt qui rescannent chacun la colonne
+        ts = df[timestamp_col].to_numpy().astype('datetime64[ns]')
+        ts_day = ts.astype('datetime64[D]')
+        ts_month = ts_day.astype('datetime64[M]')
+
+        year = ts_month.astype('datetime64[Y]').astype(np.int64) + 1970
+        month = (ts_month.astype(np.int64) % 12 + 1).astype(np.int8)
+        day = ((ts_day - ts_month).astype(np.int64) + 1).astype(np.int8)
+        # Le jour 0 (1970-01-01) est un jeudi → décalage de 3 (0=Lundi)
+        day_of_week = ((ts_day.astype(np.int64) + 3) % 7).astype(np.int8)
+
+        df['year'] = year.astype(np.int16)
+        df['month'] = month
+        df['day'] = day
+        df['day_of_week'] = day_of_week  # 0=Lundi, 6=Dimanche
+        df['hour'] = (ts.astype('datetime64[h]').astype(np.int64) % 24).astype(np.int8)
+        df['quarter'] = ((month - 1) // 3 + 1).astype(np.int8)
+
+        # Features binaires (int8 : un octet par drapeau suffit)
+        df['is_weekend'] = (day_of_week >= 5).astype(np.int8)  # Samedi/Dimanche
+        df['is_month_start'] = (day == 1).astype(np.int8)
+
+        # Fin de mois : table des longueurs de mois indexée par le mois
+        # déjà extrait, avec correction bissextile — deux comparaisons int
+        # au lieu d'une conversion datetime supplémentaire
+        days_in_month = _DAYS_IN_MONTH[month - 1] + (
+            (month == 2) & (((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0))
+        )
+        df['is_month_end'] = (day == days_in_month).astype(np.int8)
         
         logger.success("✅ Features temporelles ajoutées")
         
@@ -122,45 +157,66 @@ class CryptoFeatureEngineer:
         """
         Fusionne et enrichit avec les données Fear & Greed
         
+        Ajoute la clé de jointure directement dans df_price (pas de
+        copie : dans le pipeline, le frame est déjà détenu par l'étape
+        précédente) ; le merge produit un nouveau DataFrame.
+
         Args:
             df_price: DataFrame avec prix
             df_fear_greed: DataFrame Fear & Greed
-        
+
         Returns:
             DataFrame fusionné avec features sentiment
         """
         logger.info("😱 Ajout des features de sentiment...")
-        
-        df_price = df_price.copy()
-        df_fear_greed = df_fear_greed.copy()
-        
-        # Convertir timestamps
-        df_price['date'] = pd.to_datetime(df_price['timestamp']).dt.date
-        df_fear_greed['date'] = pd.to_datetime(df_fear_greed['timestamp']).dt.date
-        
-        # Préparer Fear & Greed
-        df_fg = df_fear_greed[['date', 'value']].rename(columns={'value': 'fear_greed_index'})
-        
-        # Fusionner
-        df = df_price.merge(df_fg, on='date', how='left')
-        
-        # Forward fill pour remplir les valeurs manquantes
-        df['fear_greed_index'] = df['fear_greed_index'].ffill()
-        
-        # Features Fear & Greed
-        df['fg_ma_7'] = df['fear_greed_index'].rolling(window=7, min_periods=1).mean()
-        df['fg_ma_30'] = df['fear_greed_index'].rolling(window=30, min_periods=1).mean()
+
+        # Clé de jointure : jour en int64 (ns // ns_par_jour) plutôt que
+        # des objets datetime.date Python — le hash-join reste numérique
+        ns_per_day = 86_400_000_000_000
+        df_price['_day'] = (pd.to_datetime(df_price['timestamp']).astype('int64') // ns_per_day)
+
+        df_fg = pd.DataFrame({
+            '_day': pd.to_datetime(df_fear_greed['timestamp']).astype('int64') // ns_per_day,
+            'fear_greed_index': df_fear_greed['value']
+        })
+
+        # Fusionner (m:1 : une valeur F&G par jour)
+        df = df_price.merge(df_fg, on='_day', how='left', validate='m:1', copy=False)
+        
+        # Forward fill pour remplir les valeurs manquantes : deux ufuncs
+        # NumPy (where + maximum.accumulate) au lieu du chemin ffill pandas
+        df['fear_greed_index'] = _ffill_float(df['fear_greed_index'].to_numpy(np.float64))
+        
+        # Features Fear & Greed : les deux moyennes glissantes dérivent des
+        # mêmes sommes cumulées (une passe sur la colonne au lieu de deux
+        # rolling pandas), NaN résiduels ignorés comme avec min_periods=1
+        fg_values = df['fear_greed_index'].to_numpy(np.float64)
+        valid = ~np.isnan(fg_values)  # NaN résiduels en tête de série
+
+        cs = np.concatenate(([0.0], np.cumsum(np.where(valid, fg_values, 0.0))))
+        cnt = np.concatenate(([0], np.cumsum(valid)))
+        ends = np.arange(1, len(fg_values) + 1)
+
+        for window, col in ((7, 'fg_ma_7'), (30, 'fg_ma_30')):
+            starts = np.maximum(ends - window, 0)
+            sums = cs[ends] - cs[starts]
+            counts = cnt[ends] - cnt[starts]
+            df[col] = np.divide(sums, counts,
+                                out=np.full(len(fg_values), np.nan), where=counts > 0)
+
         df['fg_change_7d'] = df['fear_greed_index'].diff(periods=7)
-        
-        # Catégories binaires
-        df['is_extreme_fear'] = (df['fear_greed_index'] <= 25).astype(int)
-        df['is_fear'] = ((df['fear_greed_index'] > 25) & (df['fear_greed_index'] <= 45)).astype(int)
-        df['is_neutral'] = ((df['fear_greed_index'] > 45) & (df['fear_greed_index'] <= 55)).astype(int)
-        df['is_greed'] = ((df['fear_greed_index'] > 55) & (df['fear_greed_index'] <= 75)).astype(int)
-        df['is_extreme_greed'] = (df['fear_greed_index'] > 75).astype(int)
+
+        # Catégories binaires : une recherche dichotomique vectorisée donne
+        # la zone 0..4, au lieu de 8 comparaisons sur toute la colonne ;
+        # drapeaux en int8 (8x moins de mémoire qu'int64)
+        buckets = np.searchsorted(np.array([25.0, 45.0, 55.0, 75.0]), fg_values, side='left')
+
+        for bucket, col in enumerate(['is_extreme_fear', 'is_fear', 'is_neutral',
+                                      'is_greed', 'is_extreme_greed']):
+            df[col] = ((buckets == bucket) & valid).astype(np.int8)
         
         # Nettoyer
-        df = df.drop('date', axis=1)
+        df = df.drop('_day', axis=1)
         
         logger.success("✅ Features sentiment ajoutées")
         
@@ -180,17 +236,63 @@ class CryptoFeatureEngineer:
         """
         logger.info("⏮️ Ajout des features lag...")
         
-        df = df.copy()
-        
+        # Collecter toutes les colonnes décalées puis concaténer une seule
+        # fois : chaque affectation dans la boucle re-bloquerait le frame
+        new_cols = {}
         for col in columns:
             if col in df.columns:
+                values = df[col].to_numpy()
                 for lag in lags:
-                    df[f'{col}_lag_{lag}d'] = df[col].shift(lag)
-        
+                    # max(..., 0) : si lag >= len(values), la colonne est
+                    # entièrement NaN (comme Series.shift sur série courte)
+                    shifted = np.empty(len(values))
+                    shifted[:lag] = np.nan
+                    shifted[lag:] = values[:max(len(values) - lag, 0)]
+                    new_cols[f'{col}_lag_{lag}d'] = shifted
+
+        df = pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1, copy=False)
+
         logger.success(f"✅ Features lag ajoutées ({len(columns)} colonnes × {len(lags)} lags)")
         
         return df
     
+    def create_all_features_multi(self, dfs_price, df_fear_greed=None, add_lags=True):
+        """
+        Pipeline complet en parallèle sur plusieurs cryptos
+
+        Les pipelines par symbole sont indépendants et CPU-bound :
+        un process par symbole donne un scaling quasi linéaire sur les
+        backfills multi-cryptos (même schéma que process_features.py).
+
+        Args:
+            dfs_price: Dict {symbol: DataFrame prix/volume}
+            df_fear_greed: DataFrame Fear & Greed (optionnel, partagé)
+            add_lags: Ajouter features lag (défaut True)
+
+        Returns:
+            Dict {symbol: DataFrame features}
+        """
+        logger.info(f"🚀 Feature engineering parallèle sur {len(dfs_price)} cryptos...")
+
+        results = {}
+
+        with ProcessPoolExecutor(max_workers=min(len(dfs_price), os.cpu_count() or 1)) as pool:
+            futures = {
+                pool.submit(self.create_all_features, df, df_fear_greed, add_lags): symbol
+                for symbol, df in dfs_price.items()
+            }
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Erreur features {symbol}: {e}")
+
+        logger.success(f"✅ Features calculées pour {len(results)}/{len(dfs_price)} cryptos")
+
+        return results
+
     def create_all_features(self, df_price, df_fear_greed=None, add_lags=True):
         """
         Pipeline complet : crée toutes les features
@@ -219,37 +321,106 @@ class CryptoFeatureEngineer:
         if add_lags:
             df = self.add_lag_features(df, columns=['price_usd', 'volume_24h_usd'])
         
-        # Supprimer lignes avec trop de NaN (début de série)
+        # Supprimer les lignes sans prix. sma_7 et rsi_14 n'ont jamais de
+        # NaN (min_periods=1 / RSI initialisé à 50) : inutile de scanner
+        # trois colonnes, un masque sur le prix suffit
         initial_rows = len(df)
-        df = df.dropna(subset=['price_usd', 'sma_7', 'rsi_14'])
+        valid = ~np.isnan(df['price_usd'].to_numpy(np.float64))
+        if not valid.all():
+            df = df.loc[valid]
         removed_rows = initial_rows - len(df)
         
         if removed_rows > 0:
             logger.warning(f"⚠️ {removed_rows} lignes supprimées (valeurs manquantes)")
-        
+
+        # Downcast final : float32 pour toutes les features numériques,
+        # moitié moins d'octets à écrire et à relire côté entraînement
+        float_cols = df.select_dtypes(include='float64').columns
+        if len(float_cols) > 0:
+            df = df.astype({col: np.float32 for col in float_cols})
+
         logger.success(f"🎉 Feature engineering terminé ! {len(df)} lignes × {len(df.columns)} colonnes")
         
         return df
 
 
+# Cache disque des sorties du pipeline (boucles de dev / notebooks)
+FEATURES_CACHE_DIR = '.cache/features'
+
+# Version du pipeline, mélangée à la clé : à incrémenter à chaque
+# changement des features pour invalider les caches existants
+_PIPELINE_VERSION = '2'
+
+
+def _hash_column(h, df, col, dtype=None):
+    """Ajoute le contenu complet d'une colonne à l'empreinte"""
+    if col in df.columns:
+        h.update(df[col].to_numpy(dtype).tobytes())
+
+
+def _cache_key(df_price, df_fear_greed):
+    """
+    Empreinte des entrées : version du pipeline + schéma + contenu complet
+    des colonnes dont dérivent les features
+
+    Hacher les octets des colonnes coûte quelques millisecondes face au
+    pipeline complet, et détecte les données révisées ou re-remplies dont
+    la shape et les extrémités n'ont pas bougé.
+    """
+    h = hashlib.sha1()
+    h.update(_PIPELINE_VERSION.encode())
+    h.update(repr(df_price.shape).encode())
+    h.update(','.join(df_price.columns).encode())
+    _hash_column(h, df_price, 'price_usd', np.float64)
+    _hash_column(h, df_price, 'volume_24h_usd', np.float64)
+    _hash_column(h, df_price, 'market_cap_usd', np.float64)
+    if 'timestamp' in df_price.columns:
+        h.update(pd.to_datetime(df_price['timestamp']).to_numpy().tobytes())
+    if df_fear_greed is not None:
+        h.update(repr(df_fear_greed.shape).encode())
+        _hash_column(h, df_fear_greed, 'value', np.float64)
+        if 'timestamp' in df_fear_greed.columns:
+            h.update(pd.to_datetime(df_fear_greed['timestamp']).to_numpy().tobytes())
+    return h.hexdigest()
+
+
 # Fonction pratique pour usage direct
-def engineer_features(df_price, df_fear_greed=None, save_path=None):
+def engineer_features(df_price, df_fear_greed=None, save_path=None, force=False):
     """
     Fonction simple pour créer toutes les features
-    
+
+    Les sorties sont mémoïsées sur disque (clé = empreinte des entrées) :
+    relancer sur les mêmes données court-circuite tout le pipeline.
+
     Args:
         df_price: DataFrame prix
         df_fear_greed: DataFrame Fear & Greed (optionnel)
         save_path: Chemin sauvegarde CSV (optionnel)
-    
+        force: Si True, ignore le cache et recalcule
+
     Returns:
         DataFrame avec features
     """
-    engineer = CryptoFeatureEngineer()
-    df_features = engineer.create_all_features(df_price, df_fear_greed)
-    
+    cache_path = os.path.join(FEATURES_CACHE_DIR, f"{_cache_key(df_price, df_fear_greed)}.pkl")
+
+    df_features = None
+    if not force and os.path.exists(cache_path):
+        try:
+            df_features = pd.read_pickle(cache_path)
+            logger.info(f"⚡ Features rechargées depuis le cache : {cache_path}")
+        except Exception as e:
+            logger.warning(f"⚠️ Cache features illisible ({e}), recalcul")
+            df_features = None
+
+    if df_features is None:
+        engineer = CryptoFeatureEngineer()
+        df_features = engineer.create_all_features(df_price, df_fear_greed)
+
+        os.makedirs(FEATURES_CACHE_DIR, exist_ok=True)
+        df_features.to_pickle(cache_path)
+
     if save_path:
         df_features.to_csv(save_path, index=False)
         logger.success(f"💾 Features sauvegardées : {save_path}")
-    
+
     return df_features
\ No newline at end of file
@@ -7,6 +7,8 @@ Fonctions de calcul d'indicateurs techniques pour l'analyse crypto
 import pandas as pd
 import numpy as np
 
+from . import kernels
+
 
 def calculate_sma(df, column='price_usd', window=7):
     """
@@ -20,7 +22,9 @@ def calculate_sma(df, column='price_usd', window=7):
     Returns:
         Series avec les valeurs SMA
     """
-    return df[column].rolling(window=window, min_periods=1).mean()
+    # Somme glissante compilée : pas de mise en place rolling/masque NA pandas
+    values = df[column].to_numpy(np.float64)
+    return pd.Series(kernels.rolling_mean(values, window), index=df.index)
 
 
 def calculate_ema(df, column='price_usd', span=12):
@@ -35,7 +39,8 @@ def calculate_ema(df, column='price_usd', span=12):
     Returns:
         Series avec les valeurs EMA
     """
-    return df[column].ewm(span=span, adjust=False).mean()
+    values = df[column].to_numpy(np.float64)
+    return pd.Series(kernels.ema(values, span), index=df.index)
 
 
 def calculate_rsi(df, column='price_usd', period=14):
@@ -53,46 +58,45 @@ def calculate_rsi(df, column='price_usd', period=14):
     Returns:
         Series avec les valeurs RSI (0-100)
     """
-    # Calculer les variations
-    delta = df[column].diff()
-    
-    # Séparer gains et pertes
-    gain = (delta.where(delta > 0, 0)).rolling(window=period, min_periods=1).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period, min_periods=1).mean()
-    
-    # Calculer RS et RSI
-    rs = gain / loss.replace(0, np.nan)  # Éviter division par 0
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi.fillna(50)  # Valeur neutre par défaut
+    # Gains/pertes et moyennes glissantes en une seule passe compilée
+    values = df[column].to_numpy(np.float64)
+    return pd.Series(kernels.rsi(values, period), index=df.index)
 
 
-def calculate_macd(df, column='price_usd', fast=12, slow=26, signal=9):
+def calculate_macd(df, column='price_usd', fast=12, slow=26, signal=9,
+                   ema_fast=None, ema_slow=None):
     """
     Calcule le MACD (Moving Average Convergence Divergence)
-    
+
     MACD > Signal : Signal haussier
     MACD < Signal : Signal baissier
-    
+
     Args:
         df: DataFrame avec les données
         column: Colonne sur laquelle calculer
         fast: Période EMA rapide (défaut 12)
         slow: Période EMA lente (défaut 26)
         signal: Période signal (défaut 9)
-    
+        ema_fast: EMA rapide déjà calculée (optionnel, évite une repasse)
+        ema_slow: EMA lente déjà calculée (optionnel)
+
     Returns:
         DataFrame avec colonnes macd, signal, histogram
     """
-    # EMA rapide et lente
-    ema_fast = calculate_ema(df, column, span=fast)
-    ema_slow = calculate_ema(df, column, span=slow)
+    # EMA rapide et lente : réutiliser celles de l'appelant si fournies
+    if ema_fast is None:
+        ema_fast = calculate_ema(df, column, span=fast)
+    if ema_slow is None:
+        ema_slow = calculate_ema(df, column, span=slow)
     
     # MACD line
     macd_line = ema_fast - ema_slow
-    
-    # Signal line
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+
+    # Signal line (EMA de la ligne MACD)
+    signal_line = pd.Series(
+        kernels.ema(macd_line.to_numpy(np.float64), signal),
+        index=macd_line.index
+    )
     
     # Histogram
     histogram = macd_line - signal_line
@@ -122,9 +126,12 @@ def calculate_bollinger_bands(df, column='price_usd', window=20, num_std=2):
     """
     # Bande du milieu (SMA)
     middle_band = calculate_sma(df, column, window)
-    
-    # Écart-type
-    std = df[column].rolling(window=window, min_periods=1).std()
+
+    # Écart-type glissant en une passe compilée
+    std = pd.Series(
+        kernels.rolling_std(df[column].to_numpy(np.float64), window),
+        index=df.index
+    )
     
     # Bandes supérieure et inférieure
     upper_band = middle_band + (std * num_std)
@@ -148,13 +155,21 @@ def calculate_price_changes(df, column='price_usd', periods=[1, 7, 30]):
         periods: Liste de périodes (jours)
     
     Returns:
-        DataFrame avec les variations (%)
+        Dict {nom_colonne: ndarray} avec les variations (%)
     """
-    result = pd.DataFrame()
-    
+    # Calcul direct sur le tableau NumPy : pas d'alignement d'index ni de
+    # masque NA pandas, une division vectorisée par période
+    prices = df[column].to_numpy(np.float64)
+    result = {}
+
     for period in periods:
-        result[f'price_change_{period}d'] = df[column].pct_change(periods=period) * 100
-    
+        out = np.empty_like(prices)
+        out[:period] = np.nan
+        np.divide(prices[period:], prices[:-period], out=out[period:])
+        out[period:] -= 1.0
+        out[period:] *= 100.0
+        result[f'price_change_{period}d'] = out
+
     return result
 
 
@@ -167,21 +182,30 @@ def calculate_volume_indicators(df, volume_col='volume_24h_usd'):
         volume_col: Colonne volume
     
     Returns:
-        DataFrame avec indicateurs de volume
+        Dict {nom_colonne: ndarray} avec indicateurs de volume
     """
-    result = pd.DataFrame()
-    
-    # Moyenne mobile du volume
-    result['volume_ma_7'] = df[volume_col].rolling(window=7, min_periods=1).mean()
-    result['volume_ma_30'] = df[volume_col].rolling(window=30, min_periods=1).mean()
-    
+    volume = df[volume_col].to_numpy(np.float64)
+    result = {}
+
+    # Les deux moyennes mobiles dérivent de la même somme cumulée :
+    # une seule lecture de la colonne volume pour tous les indicateurs
+    cs = np.concatenate(([0.0], np.cumsum(volume)))
+    ends = np.arange(1, len(volume) + 1)
+
+    for window, col in ((7, 'volume_ma_7'), (30, 'volume_ma_30')):
+        starts = np.maximum(ends - window, 0)
+        result[col] = (cs[ends] - cs[starts]) / (ends - starts)
+
     # Ratio volume actuel / moyenne
-    result['volume_ratio'] = df[volume_col] / result['volume_ma_7']
-    
+    result['volume_ratio'] = volume / result['volume_ma_7']
+
     # Variation de volume
-    result['volume_change_1d'] = df[volume_col].pct_change(periods=1) * 100
-    
+    change = np.empty_like(volume)
+    change[0] = np.nan
+    change[1:] = volume[1:] / volume[:-1] * 100.0 - 100.0
+    result['volume_change_1d'] = change
+
     # Spike de volume (> 2x la moyenne)
-    result['volume_spike'] = (result['volume_ratio'] > 2).astype(int)
-    
+    result['volume_spike'] = (result['volume_ratio'] > 2).astype(np.int8)
+
     return result
\ No newline at end of file
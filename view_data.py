@@ -1,68 +1,200 @@
 # view_data.py
 
+import numpy as np
 import pandas as pd
-import glob
 import os
+import sys
 
-print("=" * 60)
-print("📊 APERÇU DES DONNÉES COLLECTÉES")
-print("=" * 60)
+from src.data.manifest import load_manifest
 
-# Trouver les fichiers les plus récents
-coingecko_files = glob.glob('data/raw/coingecko_*.csv')
-fear_greed_files = glob.glob('data/raw/fear_greed_*.csv')
+# Lecteur CSV Arrow (parsing colonne, multi-thread) si disponible
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pacsv = None
+    pq = None
 
-if not coingecko_files or not fear_greed_files:
+# Noyau compilé pour la distribution F&G si Numba est disponible ;
+# sinon np.histogram reste le chemin de repli
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _bucket_fg(values):
+        """Compte les 5 zones F&G en un balayage (bornes 25/45/55/75)"""
+        counts = np.zeros(5, np.int64)
+        for x in values:
+            if x <= 25:
+                counts[0] += 1
+            elif x <= 45:
+                counts[1] += 1
+            elif x <= 55:
+                counts[2] += 1
+            elif x <= 75:
+                counts[3] += 1
+            else:
+                counts[4] += 1
+        return counts
+
+
+def load_raw_file(filepath, dtype=None, columns=None):
+    """
+    Charge un fichier brut (Parquet ou ancien CSV)
+
+    Args:
+        dtype: Types à imposer au parsing CSV (dict colonne -> dtype numpy),
+               ex. {'value': np.int8} pour stocker les entiers 0-100 sur un
+               octet au lieu de huit. Ignoré pour le Parquet (déjà typé).
+        columns: Sous-ensemble de colonnes à lire (les autres ne sont ni
+                 parsées pour le CSV, ni décodées pour le Parquet).
+    """
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath, columns=columns)
+    if pacsv is not None:
+        convert = None
+        if dtype or columns:
+            column_types = None
+            if dtype:
+                column_types = {
+                    col: pa.from_numpy_dtype(np.dtype(dt)) for col, dt in dtype.items()
+                }
+            convert = pacsv.ConvertOptions(column_types=column_types,
+                                           include_columns=columns)
+        return pacsv.read_csv(filepath, convert_options=convert).to_pandas()
+    return pd.read_csv(filepath, dtype=dtype, usecols=columns)
+
+
+def load_raw_head(filepath, n):
+    """Premières lignes d'un fichier brut (aperçu) sans parser le reste"""
+    if filepath.endswith('.parquet'):
+        if pq is not None:
+            pf = pq.ParquetFile(filepath)
+            return next(pf.iter_batches(batch_size=n)).to_pandas()
+        return pd.read_parquet(filepath).head(n)
+    return pd.read_csv(filepath, nrows=n)
+
+
+# Sortie bufferisée : les lignes sont accumulées puis écrites en un
+# seul write() au lieu d'un syscall par print
+out = []
+out.append("=" * 60)
+out.append("📊 APERÇU DES DONNÉES COLLECTÉES")
+out.append("=" * 60)
+
+# Trouver les fichiers les plus récents : d'abord le manifeste écrit par
+# collect_data.py (découverte O(1), aucun parcours de dossier), puis un
+# scan de repli pour les anciennes collectes sans manifeste
+latest_coingecko = None
+latest_fear_greed = None
+
+manifest = load_manifest()
+if manifest:
+    path = manifest.get('coingecko_latest')
+    if path and os.path.exists(path):
+        latest_coingecko = path
+    path = manifest.get('fear_greed_latest')
+    if path and os.path.exists(path):
+        latest_fear_greed = path
+
+# Repli : un seul parcours du dossier (os.scandir = un getdents, pas un
+# glob + stat par motif) ; le timestamp est dans le nom, la comparaison
+# lexicale suffit
+if latest_coingecko is None or latest_fear_greed is None:
+    scan_coingecko = None
+    scan_fear_greed = None
+    try:
+        with os.scandir('data/raw') as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.endswith('.parquet') or name.endswith('.csv')):
+                    continue
+                if name.startswith('coingecko_'):
+                    if scan_coingecko is None or entry.path > scan_coingecko:
+                        scan_coingecko = entry.path
+                elif name.startswith('fear_greed_'):
+                    if scan_fear_greed is None or entry.path > scan_fear_greed:
+                        scan_fear_greed = entry.path
+    except FileNotFoundError:
+        pass
+    if latest_coingecko is None:
+        latest_coingecko = scan_coingecko
+    if latest_fear_greed is None:
+        latest_fear_greed = scan_fear_greed
+
+if latest_coingecko is None or latest_fear_greed is None:
     print("❌ Aucun fichier trouvé. Lancez d'abord: python collect_data.py")
     exit(1)
 
-# Fichiers les plus récents
-latest_coingecko = max(coingecko_files, key=os.path.getctime)
-latest_fear_greed = max(fear_greed_files, key=os.path.getctime)
-
-print(f"\n📁 Fichiers analysés:")
-print(f"   CoinGecko: {os.path.basename(latest_coingecko)}")
-print(f"   Fear & Greed: {os.path.basename(latest_fear_greed)}")
+out.append(f"\n📁 Fichiers analysés:")
+out.append(f"   CoinGecko: {os.path.basename(latest_coingecko)}")
+out.append(f"   Fear & Greed: {os.path.basename(latest_fear_greed)}")
 
 # Charger CoinGecko
-print("\n" + "=" * 60)
-print("💰 DONNÉES COINGECKO")
-print("=" * 60)
+out.append("\n" + "=" * 60)
+out.append("💰 DONNÉES COINGECKO")
+out.append("=" * 60)
 
-df_cg = pd.read_csv(latest_coingecko)
-print(f"\nShape: {df_cg.shape}")
-print("\nAperçu:")
-print(df_cg.to_string())
+# Deux lectures spécialisées : les stats ne parsent que les 3 colonnes
+# numériques réduites, l'aperçu ne parse que les 20 premières lignes —
+# jamais le produit complet lignes × colonnes
+df_cg = load_raw_file(latest_coingecko,
+                      columns=['price_usd', 'market_cap_usd', 'volume_24h_usd'])
+df_cg_head = load_raw_head(latest_coingecko, 20)
+out.append(f"\nShape: ({len(df_cg)}, {len(df_cg_head.columns)})")
+out.append("\nAperçu:")
+# Aperçu borné : le formatage Python de to_string() est en O(lignes ×
+# colonnes), inutile de rendre plus de 20 lignes pour un coup d'œil
+out.append(df_cg_head.to_string())
 
-print(f"\n📊 Statistiques:")
-print(f"   Prix moyen: ${df_cg['price_usd'].mean():,.2f}")
-print(f"   Market Cap total: ${df_cg['market_cap_usd'].sum():,.0f}")
-print(f"   Volume 24h total: ${df_cg['volume_24h_usd'].sum():,.0f}")
+out.append(f"\n📊 Statistiques:")
+out.append(f"   Prix moyen: ${df_cg['price_usd'].mean():,.2f}")
+out.append(f"   Market Cap total: ${df_cg['market_cap_usd'].sum():,.0f}")
+out.append(f"   Volume 24h total: ${df_cg['volume_24h_usd'].sum():,.0f}")
 
 # Charger Fear & Greed
-print("\n" + "=" * 60)
-print("😱 DONNÉES FEAR & GREED")
-print("=" * 60)
-
-df_fg = pd.read_csv(latest_fear_greed)
-print(f"\nShape: {df_fg.shape}")
-print("\n10 derniers jours:")
-print(df_fg.tail(10).to_string())
-
-print(f"\n📊 Statistiques:")
-print(f"   Moyenne: {df_fg['value'].mean():.1f}")
-print(f"   Médiane: {df_fg['value'].median():.1f}")
-print(f"   Min: {df_fg['value'].min()}")
-print(f"   Max: {df_fg['value'].max()}")
-
-# Distribution
-print(f"\n📊 Distribution:")
-print(f"   Extreme Fear (0-25): {len(df_fg[df_fg['value'] <= 25])} jours")
-print(f"   Fear (26-45): {len(df_fg[(df_fg['value'] > 25) & (df_fg['value'] <= 45)])} jours")
-print(f"   Neutral (46-55): {len(df_fg[(df_fg['value'] > 45) & (df_fg['value'] <= 55)])} jours")
-print(f"   Greed (56-75): {len(df_fg[(df_fg['value'] > 55) & (df_fg['value'] <= 75)])} jours")
-print(f"   Extreme Greed (76-100): {len(df_fg[df_fg['value'] > 75])} jours")
-
-print("\n" + "=" * 60)
-print("✅ Données prêtes pour l'analyse !")
-print("=" * 60)
\ No newline at end of file
+out.append("\n" + "=" * 60)
+out.append("😱 DONNÉES FEAR & GREED")
+out.append("=" * 60)
+
+# Les valeurs F&G sont des entiers 0-100 : int8 dès le parsing, les
+# réductions touchent 1 octet par élément au lieu de 8
+df_fg = load_raw_file(latest_fear_greed, dtype={'value': np.int8})
+out.append(f"\nShape: {df_fg.shape}")
+out.append("\n10 derniers jours:")
+out.append(df_fg.tail(10).to_string())
+
+# Colonne extraite une fois : les réductions tournent en NumPy pur,
+# sans repasser par le dispatch pandas à chaque statistique
+fg_values = df_fg['value'].to_numpy()
+
+out.append(f"\n📊 Statistiques:")
+out.append(f"   Moyenne: {fg_values.mean():.1f}")
+out.append(f"   Médiane: {np.median(fg_values):.1f}")
+out.append(f"   Min: {fg_values.min()}")
+out.append(f"   Max: {fg_values.max()}")
+
+# Distribution : une seule passe, noyau compilé si Numba est là,
+# np.histogram sinon (toujours mieux que 5 masques booléens)
+if njit is not None:
+    counts = _bucket_fg(fg_values)
+else:
+    counts, _ = np.histogram(fg_values, bins=np.array([0, 25.5, 45.5, 55.5, 75.5, 101]))
+
+out.append(f"\n📊 Distribution:")
+out.append(f"   Extreme Fear (0-25): {counts[0]} jours")
+out.append(f"   Fear (26-45): {counts[1]} jours")
+out.append(f"   Neutral (46-55): {counts[2]} jours")
+out.append(f"   Greed (56-75): {counts[3]} jours")
+out.append(f"   Extreme Greed (76-100): {counts[4]} jours")
+
+out.append("\n" + "=" * 60)
+out.append("✅ Données prêtes pour l'analyse !")
+out.append("=" * 60)
+
+sys.stdout.write("\n".join(out) + "\n")
\ No newline at end of file
@@ -1,97 +1,232 @@
 # view_features.py
 
+import numpy as np
 import pandas as pd
-import glob
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from src.data.manifest import load_manifest
+
+# Lecteurs Arrow (parsing colonne, métadonnées Parquet) si disponibles
+try:
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pacsv = None
+    pq = None
+
+
+def load_features_head(filepath):
+    """
+    Première ligne + nombre total de lignes d'un fichier de features
+
+    L'affichage ne consomme que df.iloc[0], les colonnes et le shape :
+    inutile de parser tout le fichier. Pour le Parquet, le nombre de
+    lignes vient des métadonnées du footer (zéro donnée lue) ; pour le
+    CSV, d'un comptage de lignes brut.
+
+    Returns:
+        (DataFrame d'une ligne, nombre total de lignes)
+    """
+    if filepath.endswith('.parquet'):
+        if pq is not None:
+            pf = pq.ParquetFile(filepath)
+            head = next(pf.iter_batches(batch_size=1)).to_pandas()
+            return head, pf.metadata.num_rows
+        df = pd.read_parquet(filepath)
+        return df.head(1), len(df)
+
+    head = pd.read_csv(filepath, nrows=1)
+    with open(filepath, 'rb') as f:
+        n_rows = sum(1 for _ in f) - 1  # - l'en-tête
+    return head, n_rows
+
+
+# Motifs de catégorisation des colonnes, compilés une seule fois
+CATEGORY_PATTERNS = [
+    ('Prix & Volume', re.compile(r'price|volume|market')),
+    ('Indicateurs Tech', re.compile(r'sma|ema|rsi|macd|bb')),
+    ('Temporel', re.compile(r'year|month|day|hour|weekend')),
+    ('Sentiment', re.compile(r'fear|greed|fg')),
+    ('Lag', re.compile(r'lag')),
+]
 
 print("=" * 60)
 print("🔍 APERÇU DES FEATURES CRÉÉES")
 print("=" * 60)
 
-# Trouver les fichiers les plus récents
-feature_files = glob.glob('data/processed/*_features_*.csv')
+# Trouver les fichiers les plus récents : d'abord le manifeste écrit par
+# process_features.py (découverte O(1), un fragment par symbole), puis le
+# scan des dossiers pour les runs antérieurs au manifeste.
+cryptos = {}
+
+manifest = load_manifest()
+if manifest:
+    for symbol, run_dir in (manifest.get('features') or {}).items():
+        if not os.path.isdir(run_dir):
+            continue
+        with os.scandir(run_dir) as parts:
+            for part in parts:
+                if part.name.endswith('.parquet'):
+                    cryptos[symbol] = part.path
+                    break
+
+# Repli quand le manifeste est absent ou périmé : parcours par
+# os.scandir (un getdents par dossier), et seul le dernier run_date de
+# chaque symbole est visité (pas de glob récursif qui énumérerait tous
+# les runs historiques)
+if not cryptos:
+    try:
+        with os.scandir('data/processed/features') as symbol_dirs:
+            for symbol_entry in symbol_dirs:
+                if not symbol_entry.name.startswith('symbol=') or not symbol_entry.is_dir():
+                    continue
+                crypto = symbol_entry.name.split('=', 1)[1].upper()
+
+                # Dernier run_date (lexical = chronologique dans le layout Hive)
+                latest_run = None
+                with os.scandir(symbol_entry.path) as run_dirs:
+                    for run_entry in run_dirs:
+                        if run_entry.name.startswith('run_date=') and run_entry.is_dir():
+                            if latest_run is None or run_entry.name > latest_run.name:
+                                latest_run = run_entry
+
+                if latest_run is not None:
+                    with os.scandir(latest_run.path) as parts:
+                        for part in parts:
+                            if part.name.endswith('.parquet'):
+                                cryptos[crypto] = part.path
+                                break
+    except FileNotFoundError:
+        pass
 
-if not feature_files:
+    legacy_latest = {}
+    try:
+        with os.scandir('data/processed') as entries:
+            for entry in entries:
+                name = entry.name
+                if '_features_' not in name or not (name.endswith('.parquet') or name.endswith('.csv')):
+                    continue
+                # partition : s'arrête au premier séparateur sans allouer de liste
+                crypto = name.partition('_features_')[0].upper()
+                # Le timestamp est dans le nom : comparaison lexicale, pas de stat()
+                if crypto not in legacy_latest or entry.path > legacy_latest[crypto]:
+                    legacy_latest[crypto] = entry.path
+    except FileNotFoundError:
+        pass
+
+    for crypto, file in legacy_latest.items():
+        cryptos.setdefault(crypto, file)
+
+if not cryptos:
     print("❌ Aucun fichier de features trouvé.")
     print("   Lancez d'abord: python process_features.py")
     exit(1)
 
-# Grouper par crypto
-cryptos = {}
-for file in feature_files:
-    basename = os.path.basename(file)
-    crypto = basename.split('_features_')[0].upper()
-    if crypto not in cryptos or os.path.getctime(file) > os.path.getctime(cryptos[crypto]):
-        cryptos[crypto] = file
+@lru_cache(maxsize=4)
+def classify_columns(columns):
+    """
+    Catégorise un schéma de colonnes (un seul passage, motifs précompilés)
 
-print(f"\n📁 {len(cryptos)} cryptos avec features:\n")
+    Mémoïsé sur le tuple de colonnes : les cryptos partagent le même
+    schéma de features, la classification ne se fait donc qu'une fois.
+    Une colonne peut appartenir à plusieurs catégories.
+    """
+    categories = {name: [] for name, _ in CATEGORY_PATTERNS}
+    categories['Autres'] = []
+    for col in columns:
+        lower = col.lower()
+        matched = False
+        for name, pattern in CATEGORY_PATTERNS:
+            if pattern.search(lower):
+                categories[name].append(col)
+                matched = True
+        if not matched:
+            categories['Autres'].append(col)
+    return categories
+
+
+def summarize_crypto(crypto, filepath):
+    """Construit le résumé texte d'une crypto (exécutable en parallèle)"""
+    lines = []
+    lines.append(f"{'='*60}")
+    lines.append(f"💰 {crypto}")
+    lines.append(f"{'='*60}")
+
+    df, n_rows = load_features_head(filepath)
+
+    # Le partitionnement Hive encode symbol dans le chemin, pas dans le
+    # fragment : ré-attacher la colonne pour retrouver le schéma complet
+    if 'symbol' not in df.columns:
+        df = df.assign(symbol=crypto)
+
+    # Extraire la ligne d'affichage une seule fois : chaque df[col].iloc[0]
+    # construirait une Series intermédiaire par accès
+    row0 = df.iloc[0].to_numpy()
+    col_idx = {col: i for i, col in enumerate(df.columns)}
+
+    lines.append(f"\n📊 Shape: {n_rows} lignes × {len(df.columns)} colonnes")
 
-for crypto, filepath in sorted(cryptos.items()):
-    print(f"{'='*60}")
-    print(f"💰 {crypto}")
-    print(f"{'='*60}")
-    
-    df = pd.read_csv(filepath)
-    
-    print(f"\n📊 Shape: {df.shape[0]} lignes × {df.shape[1]} colonnes")
-    
     # Colonnes principales
-    print(f"\n📋 Colonnes créées ({len(df.columns)}) :")
-    
-    categories = {
-        'Prix & Volume': [c for c in df.columns if any(x in c.lower() for x in ['price', 'volume', 'market'])],
-        'Indicateurs Tech': [c for c in df.columns if any(x in c.lower() for x in ['sma', 'ema', 'rsi', 'macd', 'bb'])],
-        'Temporel': [c for c in df.columns if any(x in c.lower() for x in ['year', 'month', 'day', 'hour', 'weekend'])],
-        'Sentiment': [c for c in df.columns if any(x in c.lower() for x in ['fear', 'greed', 'fg'])],
-        'Lag': [c for c in df.columns if 'lag' in c.lower()],
-        'Autres': []
-    }
-    
-    # Assigner les colonnes non catégorisées
-    all_categorized = sum(categories.values(), [])
-    categories['Autres'] = [c for c in df.columns if c not in all_categorized]
-    
+    lines.append(f"\n📋 Colonnes créées ({len(df.columns)}) :")
+
+    categories = classify_columns(tuple(df.columns))
+
     for cat, cols in categories.items():
         if cols:
-            print(f"\n  {cat} ({len(cols)}):")
+            lines.append(f"\n  {cat} ({len(cols)}):")
             for col in cols[:5]:  # Max 5 par catégorie
-                value = df[col].iloc[0]
+                value = row0[col_idx[col]]
                 if pd.notna(value):
-                    if isinstance(value, float):
-                        print(f"    • {col:<30} = {value:.2f}")
+                    # np.floating couvre les float32 des fichiers compactés
+                    if isinstance(value, (float, np.floating)):
+                        lines.append(f"    • {col:<30} = {value:.2f}")
                     else:
-                        print(f"    • {col:<30} = {value}")
+                        lines.append(f"    • {col:<30} = {value}")
             if len(cols) > 5:
-                print(f"    ... et {len(cols)-5} autres")
-    
+                lines.append(f"    ... et {len(cols)-5} autres")
+
     # Quelques stats intéressantes
-    print(f"\n🎯 Signaux Trading:")
-    
-    if 'rsi_14' in df.columns:
-        rsi = df['rsi_14'].iloc[0]
+    lines.append(f"\n🎯 Signaux Trading:")
+
+    if 'rsi_14' in col_idx:
+        rsi = row0[col_idx['rsi_14']]
         if rsi < 30:
-            print(f"    📉 RSI = {rsi:.1f} → SUR-VENDU (signal d'achat potentiel)")
+            lines.append(f"    📉 RSI = {rsi:.1f} → SUR-VENDU (signal d'achat potentiel)")
         elif rsi > 70:
-            print(f"    📈 RSI = {rsi:.1f} → SUR-ACHETÉ (signal de vente potentiel)")
+            lines.append(f"    📈 RSI = {rsi:.1f} → SUR-ACHETÉ (signal de vente potentiel)")
         else:
-            print(f"    😐 RSI = {rsi:.1f} → Neutre")
-    
-    if 'sma_crossover' in df.columns:
-        crossover = df['sma_crossover'].iloc[0]
+            lines.append(f"    😐 RSI = {rsi:.1f} → Neutre")
+
+    if 'sma_crossover' in col_idx:
+        crossover = row0[col_idx['sma_crossover']]
         if crossover == 1:
-            print(f"    ✅ SMA Crossover → Golden Cross (tendance haussière)")
+            lines.append(f"    ✅ SMA Crossover → Golden Cross (tendance haussière)")
         else:
-            print(f"    ❌ SMA Crossover → Death Cross (tendance baissière)")
-    
-    if 'is_extreme_fear' in df.columns and df['is_extreme_fear'].iloc[0] == 1:
-        fg_value = df['fear_greed_index'].iloc[0]
-        print(f"    😱 Extreme Fear ({fg_value:.0f}) → Opportunité d'achat (contrarian)")
-    
-    if 'is_extreme_greed' in df.columns and df['is_extreme_greed'].iloc[0] == 1:
-        fg_value = df['fear_greed_index'].iloc[0]
-        print(f"    🤑 Extreme Greed ({fg_value:.0f}) → Prudence, correction possible")
-    
-    print()
+            lines.append(f"    ❌ SMA Crossover → Death Cross (tendance baissière)")
+
+    if 'is_extreme_fear' in col_idx and row0[col_idx['is_extreme_fear']] == 1:
+        fg_value = row0[col_idx['fear_greed_index']]
+        lines.append(f"    😱 Extreme Fear ({fg_value:.0f}) → Opportunité d'achat (contrarian)")
+
+    if 'is_extreme_greed' in col_idx and row0[col_idx['is_extreme_greed']] == 1:
+        fg_value = row0[col_idx['fear_greed_index']]
+        lines.append(f"    🤑 Extreme Greed ({fg_value:.0f}) → Prudence, correction possible")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+print(f"\n📁 {len(cryptos)} cryptos avec features:\n")
+
+# Lectures indépendantes et I/O-bound : un thread par crypto, affichage
+# ordonné dans le thread principal (ex.map préserve l'ordre d'entrée)
+sorted_items = sorted(cryptos.items())
+with ThreadPoolExecutor(max_workers=min(8, len(sorted_items))) as pool:
+    for summary in pool.map(lambda item: summarize_crypto(*item), sorted_items):
+        print(summary)
 
 print("=" * 60)
 print("✅ Toutes les features sont prêtes pour le Machine Learning !")